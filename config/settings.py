@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -28,6 +29,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'games.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -57,10 +59,25 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 128 * 1024 * 1024)),
+    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -32000)),
+    'temp_store': 'MEMORY',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+            'timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 20)),
+            'transaction_mode': 'IMMEDIATE',
+        },
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -145,9 +162,51 @@ LOGGING = {
     },
 }
 
-CELERY_BROKER_URL = 'redis://localhost:6379/0'
-CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+# The page cache carries the data version that workers and management commands
+# bump after writes, so it has to be shared between processes. A per-process
+# locmem cache is only for single-process development.
+if os.getenv('LOCMEM_CACHE') == 'True':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'continuum',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_CACHE_URL', REDIS_URL),
+            'KEY_PREFIX': 'continuum',
+        }
+    }
+
+GAMES_METRICS_ENDPOINT = os.getenv('GAMES_METRICS_ENDPOINT') == 'True'
+GAMES_METRICS_N_PLUS_ONE_THRESHOLD = int(os.getenv('GAMES_METRICS_N_PLUS_ONE_THRESHOLD', 5))
+GAMES_METRICS_QUERY_BUDGETS = {
+    'games:game-list': 6,
+    'games:game-detail': 4,
+    'games:dashboard': 4,
+    'games:import_status': 3,
+}
+
+CELERY_BROKER_URL = REDIS_URL
+CELERY_RESULT_BACKEND = REDIS_URL
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_BEAT_SCHEDULE = {
+    'compact-game-activity': {
+        'task': 'games.tasks.compact_game_activity',
+        'schedule': crontab(hour=4, minute=0),
+    },
+    'refresh-store-details': {
+        'task': 'games.tasks.refresh_store_details',
+        'schedule': float(os.getenv('STORE_REFRESH_INTERVAL', 300)),
+        'options': {'expires': float(os.getenv('STORE_REFRESH_INTERVAL', 300))},
+    },
+}
@@ -1,7 +1,10 @@
 from django.contrib import admin
 from django.urls import include, path
 
+from games.views import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('games/', include('games.urls', namespace='games')),
+    path('metrics', metrics_view, name='metrics'),
 ]
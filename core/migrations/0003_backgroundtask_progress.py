@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 18:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backgroundtask',
+            name='progress',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -1,5 +1,5 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
 
@@ -29,6 +29,7 @@ class BackgroundTask(TimeStampedModel):
         choices=Status.choices,
         default=Status.PENDING
     )
+    progress = models.JSONField(default=dict, blank=True)
 
     class Meta:
         ordering = ('-created_at',)
@@ -43,3 +44,33 @@ class BackgroundTask(TimeStampedModel):
     @classmethod
     def change_status(cls, db_task_id: int, new_status: str):
         cls.objects.filter(id=db_task_id).update(status=new_status)
+
+    @classmethod
+    def update_progress(
+        cls,
+        db_task_id: int,
+        phase: str | None = None,
+        part: str | None = None,
+        **counters: int
+    ) -> dict:
+        with transaction.atomic():
+            task = cls.objects.select_for_update().filter(id=db_task_id).first()
+            if not task:
+                return {}
+
+            progress = task.progress
+            if part is None:
+                for name, value in counters.items():
+                    progress[name] = progress.get(name, 0) + value
+            else:
+                # Counters reported for a part replace its previous report, so a
+                # retried unit of work is not counted twice.
+                parts = progress.setdefault('parts', {})
+                parts[part] = counters
+                for name in counters:
+                    progress[name] = sum(values.get(name, 0) for values in parts.values())
+            if phase:
+                progress['phase'] = phase
+
+            task.save(update_fields=['progress', 'updated_at'])
+            return progress
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Game, GameActivity
+from .models import Game, GameActivity, GameQuerySet, ImportStageMetric, SteamSyncWatermark, StoreDetails
 
 
 @admin.register(Game)
@@ -10,6 +10,19 @@ class GameAdmin(admin.ModelAdmin):
     ordering = ('-playtime',)
     readonly_fields = ('created_at', 'updated_at')
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name.endswith('_changelist'):
+            return queryset.without_payload()
+        return queryset
+
+
+class GameListFilter(admin.RelatedFieldListFilter):
+    def field_choices(self, field, request, model_admin):
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        games = Game.objects.for_list().order_by(*ordering)
+        return [(game.pk, str(game)) for game in games]
+
 
 @admin.register(GameActivity)
 class GameActivityAdmin(admin.ModelAdmin):
@@ -17,5 +30,54 @@ class GameActivityAdmin(admin.ModelAdmin):
     search_fields = ('game__name',)
     ordering = ('-created_at',)
     readonly_fields = ('created_at',)
-    list_filter = ('created_at', 'game',)
+    list_filter = ('created_at', ('game', GameListFilter),)
     list_select_related = ('game',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer(
+            *(f'game__{field}' for field in GameQuerySet.HEAVY_FIELDS)
+        )
+
+
+@admin.register(StoreDetails)
+class StoreDetailsAdmin(admin.ModelAdmin):
+    list_display = ('app_id', 'success', 'expires_at', 'accessed_at')
+    search_fields = ('app_id',)
+    ordering = ('-accessed_at',)
+    readonly_fields = ('created_at', 'updated_at')
+    list_filter = ('success',)
+
+
+@admin.register(SteamSyncWatermark)
+class SteamSyncWatermarkAdmin(admin.ModelAdmin):
+    list_display = ('steam_id', 'last_synced_at', 'last_played_at')
+    search_fields = ('steam_id',)
+    readonly_fields = ('created_at', 'updated_at')
+
+
+@admin.register(ImportStageMetric)
+class ImportStageMetricAdmin(admin.ModelAdmin):
+    list_display = (
+        'task', 'stage', 'count', 'avg_ms', 'p95_ms', 'max_ms', 'total_time', 'rows_per_second', 'retries',
+    )
+    list_filter = ('stage',)
+    search_fields = ('task__task_id',)
+    ordering = ('-task__created_at', 'stage')
+    readonly_fields = ('created_at', 'updated_at')
+    list_select_related = ('task__user',)
+
+    @admin.display(description='avg (ms)')
+    def avg_ms(self, obj):
+        return f'{obj.avg_time * 1000:.1f}'
+
+    @admin.display(description='p95 (ms)')
+    def p95_ms(self, obj):
+        return f'{obj.quantile(0.95) * 1000:.1f}'
+
+    @admin.display(description='max (ms)')
+    def max_ms(self, obj):
+        return f'{obj.max_time * 1000:.1f}'
+
+    @admin.display(description='rows/s')
+    def rows_per_second(self, obj):
+        return f'{obj.rows_per_second:.1f}'
@@ -0,0 +1,43 @@
+import hashlib
+from collections.abc import Callable
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .constants import DATA_VERSION_CACHE_KEY, PAGE_CACHE_TIMEOUT
+from .metrics import record_cache_lookup
+
+
+def get_data_version() -> int:
+    version = cache.get(DATA_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_CACHE_KEY, 1, timeout=None)
+        version = cache.get(DATA_VERSION_CACHE_KEY, 1)
+    return version
+
+
+def bump_data_version():
+    def bump():
+        try:
+            cache.incr(DATA_VERSION_CACHE_KEY)
+        except ValueError:
+            cache.set(DATA_VERSION_CACHE_KEY, 2, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def build_cache_key(prefix: str, params: dict | None = None) -> str:
+    query = urlencode(sorted((params or {}).items()), doseq=True)
+    digest = hashlib.sha1(query.encode()).hexdigest()
+    return f'games:{prefix}:v{get_data_version()}:{digest}'
+
+
+def get_or_compute(prefix: str, params: dict | None, compute: Callable, timeout: int = PAGE_CACHE_TIMEOUT):
+    key = build_cache_key(prefix, params)
+    value = cache.get(key)
+    record_cache_lookup(value is not None)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout)
+    return value
@@ -2,3 +2,72 @@ STEAM_API_URL = 'http://api.steampowered.com/IPlayerService/GetOwnedGames/v0001/
 STEAM_STORE_URL = 'http://store.steampowered.com/api/appdetails'
 STEAM_IMAGE_BASE_URL = 'http://media.steampowered.com/steamcommunity/public/images/apps/'
 STEAM_HEADER_IMAGE_BASE_URL = 'https://shared.fastly.steamstatic.com/store_item_assets/steam/apps/'
+
+STEAM_REQUEST_TIMEOUT = 10
+OWNED_GAME_FIELDS = frozenset({
+    'appid', 'name', 'sort_as', 'img_icon_url', 'capsule_filename', 'has_community_visible_stats',
+    'has_leaderboards', 'has_workshop', 'has_market', 'has_dlc', 'playtime_forever', 'playtime_2weeks',
+    'playtime_windows_forever', 'playtime_mac_forever', 'playtime_linux_forever', 'playtime_deck_forever',
+    'playtime_disconnected', 'rtime_last_played', 'content_descriptorids',
+})
+STORE_DETAILS_MARKER_FIELD = 'steam_appid'
+STORE_DETAILS_MAX_WORKERS = 8
+STORE_DETAILS_MAX_RETRIES = 3
+STORE_DETAILS_RATE = 1.5
+STORE_DETAILS_MIN_RATE = 0.2
+STORE_DETAILS_BURST = 5
+STORE_DETAILS_DEFAULT_RETRY_AFTER = 60
+STORE_DETAILS_STREAM_WINDOW = 50
+
+STORE_DETAILS_CACHE_TTL = 7 * 24 * 60 * 60
+STORE_DETAILS_CACHE_NEGATIVE_TTL = 24 * 60 * 60
+STORE_DETAILS_CACHE_TTL_JITTER = 0.1
+STORE_DETAILS_CACHE_MAX_ENTRIES = 50000
+
+GAMES_SAVE_BATCH_SIZE = 500
+
+IMPORT_CHUNK_SIZE = 100
+IMPORT_CHUNK_MAX_RETRIES = 3
+IMPORT_WRITE_BATCH_SIZE = 50
+
+IMPORT_EVENTS_CHANNEL = 'games:import:{db_task_id}'
+IMPORT_EVENTS_KEEPALIVE = 15
+IMPORT_EVENTS_STREAM_TIMEOUT = 10 * 60
+
+GAMES_SEARCH_FTS_TABLE = 'games_game_fts'
+GAMES_SEARCH_VECTOR_COLUMN = 'search_vector'
+GAMES_SEARCH_CONFIG = 'simple'
+
+HISTORY_RANGES = {
+    '30d': 30,
+    '90d': 90,
+    '1y': 365,
+    'all': None,
+}
+HISTORY_DEFAULT_RANGE = '90d'
+HISTORY_RAW_MAX_DAYS = 30
+HISTORY_DEFAULT_MAX_POINTS = 200
+HISTORY_MAX_POINTS_LIMIT = 1000
+
+DATA_VERSION_CACHE_KEY = 'games:data-version'
+PAGE_CACHE_TIMEOUT = 60 * 60
+
+GAME_ACTIVITY_RETENTION_DAYS = 180
+GAME_ACTIVITY_PRUNE_BATCH_SIZE = 1000
+GAME_ACTIVITY_PRUNE_PAUSE = 0.05
+
+EXPORT_CHUNK_SIZE = 2000
+
+SNAPSHOT_STORE_BATCH_SIZE = 500
+
+METRICS_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_N_PLUS_ONE_THRESHOLD = 5
+
+IMPORT_TELEMETRY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+STORE_DETAILS_IMPORT_CACHE_ONLY = True
+STORE_REFRESH_BUDGET = 200
+STORE_REFRESH_LOOKAHEAD = 6 * 60 * 60
+STORE_REFRESH_MISSING_STALENESS = 30
+STORE_REFRESH_RECENT_BOOST = 2.0
+STORE_REFRESH_RECENT_DAYS = 30
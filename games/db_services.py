@@ -1,44 +1,292 @@
 import logging
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime, time, timedelta
+from itertools import islice
+from time import perf_counter, sleep
 
-from .constants import STEAM_IMAGE_BASE_URL
-from .models import Game, GameActivity
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import bump_data_version
+from .constants import (
+    GAME_ACTIVITY_PRUNE_BATCH_SIZE,
+    GAME_ACTIVITY_PRUNE_PAUSE,
+    GAME_ACTIVITY_RETENTION_DAYS,
+    GAMES_SAVE_BATCH_SIZE,
+    OWNED_GAME_FIELDS,
+    STEAM_IMAGE_BASE_URL,
+    STORE_DETAILS_MARKER_FIELD,
+)
+from .models import (
+    Game,
+    GameActivity,
+    GameActivityRollup,
+    ImportStageMetric,
+    PlaytimeSummary,
+    SteamSyncWatermark,
+)
+from .normalizers import extract_promoted_fields
+from .search import GameSearchIndex
+from .telemetry import ImportTelemetry
 
 logger = logging.getLogger(__name__)
 
 
 class GameDBService:
     @staticmethod
-    def save_games(games: list[dict]) -> tuple[int, int]:
+    def save_games(games: Iterable[dict], batch_size: int = GAMES_SAVE_BATCH_SIZE) -> tuple[int, int]:
         success_count = 0
         error_count = 0
 
-        for game_data in games:
-            app_id = game_data.get('appid')
-            name = game_data.get('name', 'Unknown Game')
-            playtime = game_data.get('playtime_forever', 0) / 60
+        with transaction.atomic():
+            for batch in GameDBService._batched(games, batch_size):
+                created, errors = GameDBService._save_batch(batch)
+                success_count += created
+                error_count += errors
+            bump_data_version()
 
-            try:
-                icon_hash = game_data.get('img_icon_url')
-                icon_url = f'{STEAM_IMAGE_BASE_URL}{app_id}/{icon_hash}.jpg' if icon_hash else ''
-
-                game_obj, created = Game.objects.update_or_create(
-                    game_id=app_id,
-                    defaults={
-                        'name': name,
-                        'playtime': playtime,
-                        'icon_url': icon_url,
-                        'raw_data': game_data,
-                    }
+        return success_count, error_count
+
+    @staticmethod
+    def save_games_stream(
+        games: Iterable[dict],
+        batch_size: int = GAMES_SAVE_BATCH_SIZE,
+        on_batch: Callable[[int, int], None] | None = None,
+        telemetry: ImportTelemetry | None = None,
+    ) -> tuple[int, int]:
+        success_count = 0
+        error_count = 0
+
+        for batch in GameDBService._batched(games, batch_size):
+            with transaction.atomic():
+                created, errors = GameDBService._save_batch(batch, telemetry)
+                bump_data_version()
+            success_count += created
+            error_count += errors
+
+            if on_batch:
+                on_batch(len(batch), errors)
+
+        return success_count, error_count
+
+    @staticmethod
+    def apply_store_details(store_details: dict[str, dict], batch_size: int = GAMES_SAVE_BATCH_SIZE) -> int:
+        updated_count = 0
+
+        for batch in GameDBService._batched(store_details.items(), batch_size):
+            details = dict(batch)
+            with transaction.atomic():
+                games = list(Game.objects.filter(game_id__in=details))
+                now = timezone.now()
+                for game in games:
+                    game.raw_data = {**(game.raw_data or {}), **details[game.game_id]}
+                    promoted = extract_promoted_fields(game.raw_data)
+                    game.short_description = promoted['short_description']
+                    game.genres = promoted['genres']
+                    game.release_date = promoted['release_date']
+                    game.updated_at = now
+
+                Game.objects.bulk_update(
+                    games,
+                    ['raw_data', 'short_description', 'genres', 'release_date', 'updated_at']
+                )
+                GameSearchIndex.index_games(games)
+                bump_data_version()
+            updated_count += len(games)
+
+        return updated_count
+
+    @staticmethod
+    def prune_activity(
+        retention_days: int = GAME_ACTIVITY_RETENTION_DAYS,
+        batch_size: int = GAME_ACTIVITY_PRUNE_BATCH_SIZE,
+    ) -> int:
+        cutoff = timezone.make_aware(
+            datetime.combine(timezone.localdate() - timedelta(days=retention_days), time.min)
+        )
+        deleted_count = 0
+
+        while True:
+            with transaction.atomic():
+                expired_ids = list(
+                    GameActivity.objects
+                    .filter(created_at__lt=cutoff)
+                    .order_by('created_at')
+                    .values_list('id', flat=True)[:batch_size]
                 )
+                if not expired_ids:
+                    break
+
+                deleted, _ = GameActivity.objects.filter(id__in=expired_ids).delete()
+                deleted_count += deleted
+                bump_data_version()
+
+            sleep(GAME_ACTIVITY_PRUNE_PAUSE)
+
+        logger.info(f'Pruned {deleted_count} game activities older than {retention_days} days.')
+        return deleted_count
+
+    @staticmethod
+    def select_changed_games(games: list[dict], watermark: SteamSyncWatermark) -> list[dict]:
+        changed_games = []
+
+        for batch in GameDBService._batched(games, GAMES_SAVE_BATCH_SIZE):
+            known_playtimes = dict(
+                Game.objects
+                .filter(game_id__in=[str(game.get('appid')) for game in batch])
+                .values_list('game_id', 'playtime')
+            )
+
+            for game_data in batch:
+                known_playtime = known_playtimes.get(str(game_data.get('appid')))
+                if (
+                    known_playtime is None
+                    or round(known_playtime * 60) != game_data.get('playtime_forever', 0)
+                    or game_data.get('rtime_last_played', 0) > watermark.last_played_at
+                ):
+                    changed_games.append(game_data)
 
-                GameActivity.objects.create(game=game_obj, playtime=playtime)
+        return changed_games
 
-                if created:
-                    success_count += 1
-                    logger.info(f'Added new game: {name}')
+    @staticmethod
+    def _save_batch(games: list[dict], telemetry: ImportTelemetry | None = None) -> tuple[int, int]:
+        error_count = 0
+        rows = {}
+        started = perf_counter()
 
+        for game_data in games:
+            try:
+                game = GameDBService._build_game(game_data)
+                rows[game.game_id] = game
             except Exception as e:
                 error_count += 1
-                logger.error(f'Failed to save game: {name}, error: {e}')
+                logger.error(f"Failed to save game: {game_data.get('name', 'Unknown Game')}, error: {e}")
+
+        if telemetry:
+            telemetry.observe(ImportStageMetric.Stage.NORMALIZE, perf_counter() - started, rows=len(games))
+
+        if not rows:
+            return 0, error_count
+
+        started = perf_counter()
+        known_playtimes = dict(
+            Game.objects.filter(game_id__in=rows).values_list('game_id', 'playtime')
+        )
+        deltas = GameDBService._playtime_deltas(rows, known_playtimes)
+        GameDBService._keep_store_data(rows, known_playtimes)
+
+        try:
+            with transaction.atomic():
+                GameDBService._write_rows(list(rows.values()), deltas)
+            saved_ids = list(rows)
+        except Exception as e:
+            logger.warning(f'Batch write failed ({e}), retrying {len(rows)} games one by one')
+            saved_ids = []
+            for game_id, game in rows.items():
+                try:
+                    with transaction.atomic():
+                        GameDBService._write_rows([game], deltas)
+                    saved_ids.append(game_id)
+                except Exception as row_error:
+                    error_count += 1
+                    logger.error(f'Failed to save game: {game.name}, error: {row_error}')
+
+        if telemetry:
+            telemetry.observe(ImportStageMetric.Stage.DB_WRITE, perf_counter() - started, rows=len(saved_ids))
+
+        success_count = 0
+        for game_id in saved_ids:
+            if game_id not in known_playtimes:
+                success_count += 1
+                logger.info(f'Added new game: {rows[game_id].name}')
 
         return success_count, error_count
+
+    @staticmethod
+    def _build_game(game_data: dict) -> Game:
+        app_id = game_data.get('appid')
+        if app_id is None:
+            raise ValueError('missing appid')
+
+        icon_hash = game_data.get('img_icon_url')
+        icon_url = f'{STEAM_IMAGE_BASE_URL}{app_id}/{icon_hash}.jpg' if icon_hash else ''
+
+        return Game(
+            game_id=str(app_id),
+            name=game_data.get('name', 'Unknown Game'),
+            playtime=game_data.get('playtime_forever', 0) / 60,
+            icon_url=icon_url,
+            raw_data=game_data,
+            **extract_promoted_fields(game_data),
+        )
+
+    @staticmethod
+    def _playtime_deltas(rows: dict[str, Game], known_playtimes: dict[str, float]) -> dict[str, int]:
+        deltas = {}
+        for game_id, game in rows.items():
+            if game_id not in known_playtimes:
+                continue
+
+            delta = round(game.playtime * 60) - round(known_playtimes[game_id] * 60)
+            if delta > 0:
+                deltas[game_id] = delta
+        return deltas
+
+    @staticmethod
+    def _keep_store_data(rows: dict[str, Game], known_playtimes: dict[str, float]):
+        # Cache-only imports carry no store details for games whose cache entry is
+        # missing or evicted; keep what the row already has instead of blanking it.
+        # appdetails always include steam_appid, GetOwnedGames never does.
+        missing = [
+            game_id for game_id, game in rows.items()
+            if game_id in known_playtimes and STORE_DETAILS_MARKER_FIELD not in game.raw_data
+        ]
+        if not missing:
+            return
+
+        for game_id, raw_data in Game.objects.filter(game_id__in=missing).values_list('game_id', 'raw_data'):
+            if STORE_DETAILS_MARKER_FIELD not in (raw_data or {}):
+                continue
+
+            # Drop the stored owned-games fields so ones Steam omits (playtime_2weeks
+            # when zero) do not outlive the fresh payload.
+            store_data = {key: value for key, value in raw_data.items() if key not in OWNED_GAME_FIELDS}
+            game = rows[game_id]
+            game.raw_data = {**store_data, **game.raw_data}
+            for field, value in extract_promoted_fields(game.raw_data).items():
+                setattr(game, field, value)
+
+    @staticmethod
+    def _write_rows(games: list[Game], deltas: dict[str, int]):
+        Game.objects.bulk_create(
+            games,
+            update_conflicts=True,
+            unique_fields=['game_id'],
+            update_fields=[
+                'name', 'playtime', 'icon_url', 'raw_data', 'updated_at',
+                'playtime_2weeks', 'rtime_last_played', 'short_description', 'genres', 'release_date',
+            ],
+        )
+
+        pks = dict(
+            Game.objects
+            .filter(game_id__in=[game.game_id for game in games])
+            .values_list('game_id', 'id')
+        )
+        for game in games:
+            game.pk = pks[game.game_id]
+
+        activities = GameActivity.objects.bulk_create([
+            GameActivity(game_id=game.pk, playtime=deltas[game.game_id])
+            for game in games
+            if game.game_id in deltas
+        ])
+        PlaytimeSummary.record_sessions(activities)
+        GameActivityRollup.record(activities)
+        GameSearchIndex.index_games(games)
+
+    @staticmethod
+    def _batched(items: Iterable, size: int) -> Iterator[list]:
+        iterator = iter(items)
+        while batch := list(islice(iterator, size)):
+            yield batch
@@ -0,0 +1,63 @@
+import json
+import logging
+import time
+from collections.abc import AsyncIterator
+from functools import cache
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+
+from .constants import IMPORT_EVENTS_CHANNEL, IMPORT_EVENTS_KEEPALIVE, IMPORT_EVENTS_STREAM_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+@cache
+def _get_client() -> redis.Redis:
+    return redis.Redis.from_url(settings.REDIS_URL)
+
+
+def publish_import_event(db_task_id: int, payload: dict):
+    channel = IMPORT_EVENTS_CHANNEL.format(db_task_id=db_task_id)
+    try:
+        _get_client().publish(channel, json.dumps(payload))
+    except redis.RedisError as e:
+        logger.warning(f'Failed to publish import event for task {db_task_id}: {e}')
+
+
+async def stream_import_events(db_task, pending_status: str) -> AsyncIterator[str]:
+    channel = IMPORT_EVENTS_CHANNEL.format(db_task_id=db_task.id)
+    client = aioredis.Redis.from_url(settings.REDIS_URL)
+    pubsub = client.pubsub()
+
+    try:
+        await pubsub.subscribe(channel)
+        await db_task.arefresh_from_db(fields=['status', 'progress'])
+        yield _format_event({'status': db_task.status, 'progress': db_task.progress})
+
+        if db_task.status != pending_status:
+            return
+
+        deadline = time.monotonic() + IMPORT_EVENTS_STREAM_TIMEOUT
+        while time.monotonic() < deadline:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True,
+                timeout=IMPORT_EVENTS_KEEPALIVE
+            )
+            if message is None:
+                yield ': keepalive\n\n'
+                continue
+
+            payload = json.loads(message['data'])
+            yield _format_event(payload)
+
+            if payload.get('status') != pending_status:
+                return
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
+
+
+def _format_event(payload: dict) -> str:
+    return f'data: {json.dumps(payload)}\n\n'
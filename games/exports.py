@@ -0,0 +1,117 @@
+import csv
+import io
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from itertools import islice
+
+from django.db import models
+from django.utils import timezone
+
+from .constants import EXPORT_CHUNK_SIZE
+from .models import Game, GameActivity
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'columnar': ('application/x-ndjson', 'columns.jsonl'),
+}
+
+
+@dataclass(frozen=True)
+class ExportDataset:
+    model: type[models.Model]
+    fields: tuple[str, ...]
+    date_field: str
+
+
+EXPORT_DATASETS = {
+    'games': ExportDataset(
+        model=Game,
+        fields=(
+            'id', 'game_id', 'name', 'playtime', 'playtime_2weeks', 'rtime_last_played',
+            'genres', 'release_date', 'short_description', 'icon_url', 'created_at', 'updated_at',
+        ),
+        date_field='created_at',
+    ),
+    'activity': ExportDataset(
+        model=GameActivity,
+        fields=('id', 'game_id', 'game__game_id', 'game__name', 'playtime', 'created_at'),
+        date_field='created_at',
+    ),
+}
+
+
+def resolve_fields(dataset: str, fields: list[str] | None) -> tuple[str, ...]:
+    if dataset not in EXPORT_DATASETS:
+        raise ValueError(f'Unknown dataset: {dataset}')
+
+    available = EXPORT_DATASETS[dataset].fields
+    if not fields:
+        return available
+
+    unknown = [field for field in fields if field not in available]
+    if unknown:
+        raise ValueError(f'Unknown fields for {dataset}: {", ".join(unknown)}')
+    return tuple(fields)
+
+
+def export_queryset(dataset: str, fields: tuple[str, ...], start: date | None, end: date | None) -> models.QuerySet:
+    config = EXPORT_DATASETS[dataset]
+    queryset = config.model.objects.order_by('pk')
+
+    if start is not None:
+        queryset = queryset.filter(**{
+            f'{config.date_field}__gte': timezone.make_aware(datetime.combine(start, time.min))
+        })
+    if end is not None:
+        queryset = queryset.filter(**{
+            f'{config.date_field}__lte': timezone.make_aware(datetime.combine(end, time.max))
+        })
+
+    return queryset.values_list(*fields)
+
+
+def iter_export_chunks(
+    dataset: str,
+    export_format: str,
+    fields: list[str] | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[str]:
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f'Unknown export format: {export_format}')
+
+    fields = resolve_fields(dataset, fields)
+    rows = export_queryset(dataset, fields, start, end).iterator(chunk_size=chunk_size)
+
+    if export_format == 'csv':
+        yield _csv_lines([fields])
+    elif export_format == 'columnar':
+        yield _json_line({'fields': fields})
+
+    while chunk := list(islice(rows, chunk_size)):
+        if export_format == 'csv':
+            yield _csv_lines([[_serialize(value) for value in row] for row in chunk])
+        elif export_format == 'jsonl':
+            yield ''.join(_json_line(dict(zip(fields, row))) for row in chunk)
+        else:
+            yield _json_line({'columns': [list(column) for column in zip(*chunk)]})
+
+
+def _csv_lines(rows: list) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def _json_line(payload: dict) -> str:
+    return json.dumps(payload, default=_serialize, separators=(',', ':')) + '\n'
+
+
+def _serialize(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
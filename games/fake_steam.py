@@ -0,0 +1,184 @@
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .constants import STEAM_API_URL, STEAM_STORE_URL
+from .rate_limiter import TokenBucket
+
+OWNED_GAMES_PATH = urlparse(STEAM_API_URL).path
+APP_DETAILS_PATH = urlparse(STEAM_STORE_URL).path
+FAKE_APP_ID_START = 10
+FAKE_GENRES = ('Action', 'Adventure', 'RPG', 'Strategy', 'Simulation', 'Indie', 'Puzzle', 'Racing')
+
+
+@dataclass
+class FakeSteamConfig:
+    game_count: int = 1000
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    rate_limit: float = 0.0
+    rate_limit_burst: int = 10
+    retry_after: int = 1
+    failure_rate: float = 0.0
+    unlisted_rate: float = 0.0
+    seed: int = 0
+
+
+class FakeSteamServer:
+    def __init__(self, config: FakeSteamConfig | None = None, host: str = '127.0.0.1', port: int = 0):
+        self.config = config or FakeSteamConfig()
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        self._random = random.Random(self.config.seed)
+        self._rate_limiter = (
+            TokenBucket(rate=self.config.rate_limit, capacity=self.config.rate_limit_burst)
+            if self.config.rate_limit else None
+        )
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def api_url(self) -> str:
+        return f'{self.url}{OWNED_GAMES_PATH}'
+
+    @property
+    def store_url(self) -> str:
+        return f'{self.url}{APP_DETAILS_PATH}'
+
+    def start(self) -> 'FakeSteamServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.stats.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def owned_games(self) -> list[dict]:
+        return [self._owned_game(app_id) for app_id in self._app_ids()]
+
+    def app_details(self, app_id: int) -> dict:
+        rng = random.Random(f'{self.config.seed}:{app_id}')
+        return {
+            'steam_appid': app_id,
+            'name': f'Fake Game {app_id}',
+            'short_description': f'Synthetic store entry {app_id} used for import benchmarks.',
+            'genres': [
+                {'id': str(index), 'description': genre}
+                for index, genre in enumerate(rng.sample(FAKE_GENRES, 2))
+            ],
+            'developers': [f'Studio {app_id % 97}'],
+            'release_date': {'coming_soon': False, 'date': f'{rng.randint(1, 28)} Mar, {rng.randint(2000, 2025)}'},
+            'header_image': f'https://example.invalid/{app_id}/header.jpg',
+        }
+
+    def _app_ids(self) -> range:
+        return range(FAKE_APP_ID_START, FAKE_APP_ID_START + self.config.game_count * 10, 10)
+
+    def _owned_game(self, app_id: int) -> dict:
+        rng = random.Random(f'{self.config.seed}:{app_id}')
+        playtime = rng.choice((0, rng.randint(1, 20000)))
+        return {
+            'appid': app_id,
+            'name': f'Fake Game {app_id}',
+            'playtime_forever': playtime,
+            'playtime_2weeks': rng.randint(0, 600) if playtime else 0,
+            'img_icon_url': f'{app_id:040x}',
+            'rtime_last_played': 1600000000 + rng.randint(0, 150000000) if playtime else 0,
+        }
+
+    def _record(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                server._record('requests')
+
+                if server.config.latency or server.config.latency_jitter:
+                    time.sleep(server.config.latency + server._random.uniform(0, server.config.latency_jitter))
+
+                if url.path == OWNED_GAMES_PATH:
+                    server._record('owned_games')
+                    games = server.owned_games()
+                    self._send_json({'response': {'game_count': len(games), 'games': games}})
+                elif url.path == APP_DETAILS_PATH:
+                    server._record('app_details')
+                    self._send_app_details(params.get('appids', [''])[0])
+                else:
+                    self.send_error(HTTPStatus.NOT_FOUND)
+
+            def _send_app_details(self, app_id: str):
+                if server._rate_limiter and not server._rate_limiter.try_acquire():
+                    server._record('rate_limited')
+                    self.send_response(HTTPStatus.TOO_MANY_REQUESTS)
+                    self.send_header('Retry-After', str(server.config.retry_after))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                if server._random.random() < server.config.failure_rate:
+                    server._record('failures')
+                    self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR)
+                    return
+
+                etag = f'"{server.config.seed}-{app_id}"'
+                if self.headers.get('If-None-Match') == etag:
+                    server._record('not_modified')
+                    self.send_response(HTTPStatus.NOT_MODIFIED)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+
+                if not app_id.isdigit() or server._random.random() < server.config.unlisted_rate:
+                    self._send_json({app_id: {'success': False}}, etag)
+                    return
+
+                self._send_json({app_id: {'success': True, 'data': server.app_details(int(app_id))}}, etag)
+
+            def _send_json(self, payload: dict, etag: str = ''):
+                body = json.dumps(payload).encode()
+                self.send_response(HTTPStatus.OK)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                if etag:
+                    self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,105 @@
+from datetime import date, datetime, time, timedelta
+
+from django.utils import timezone
+
+from .constants import HISTORY_RANGES, HISTORY_RAW_MAX_DAYS
+from .models import Game, GameActivityRollup
+
+PERIOD_DAYS = (
+    (GameActivityRollup.Period.DAY, 1),
+    (GameActivityRollup.Period.WEEK, 7),
+    (GameActivityRollup.Period.MONTH, 30),
+)
+RAW_GRANULARITY = 'raw'
+
+
+def resolve_range(history_range: str | None, start: date | None, end: date | None) -> tuple[date | None, date]:
+    end = end or timezone.localdate()
+    if start is None and history_range in HISTORY_RANGES and HISTORY_RANGES[history_range] is not None:
+        start = end - timedelta(days=HISTORY_RANGES[history_range])
+    return start, end
+
+
+def pick_granularity(start: date | None, end: date, max_points: int) -> str:
+    if start is not None and (end - start).days <= HISTORY_RAW_MAX_DAYS:
+        return RAW_GRANULARITY
+
+    span_days = (end - start).days if start is not None else None
+    for period, days in PERIOD_DAYS:
+        if span_days is not None and span_days / days <= max_points:
+            return period
+    return GameActivityRollup.Period.MONTH
+
+
+def get_playtime_series(game: Game, start: date | None, end: date, max_points: int) -> dict:
+    granularity = pick_granularity(start, end, max_points)
+    end_of_range = timezone.make_aware(datetime.combine(end, time.max))
+
+    if granularity == RAW_GRANULARITY:
+        activities = game.history.filter(created_at__lte=end_of_range)
+        if start is not None:
+            activities = activities.filter(
+                created_at__gte=timezone.make_aware(datetime.combine(start, time.min))
+            )
+        points = list(activities.order_by('created_at').values_list('created_at', 'playtime'))
+    else:
+        rollups = game.rollups.filter(period=granularity, bucket_start__lte=end)
+        if start is not None:
+            rollups = rollups.filter(
+                bucket_start__gte=GameActivityRollup.bucket_for(granularity, start)
+            )
+        points = list(rollups.order_by('bucket_start').values_list('bucket_start', 'playtime'))
+
+    points = downsample_lttb(points, max_points)
+
+    return {
+        'granularity': granularity,
+        'dates': [point_date.isoformat() for point_date, _ in points],
+        'playtimes': [playtime for _, playtime in points],
+    }
+
+
+def downsample_lttb(points: list[tuple], threshold: int) -> list[tuple]:
+    if threshold < 3 or len(points) <= threshold:
+        return points
+
+    xs = [_to_number(x) for x, _ in points]
+    ys = [y for _, y in points]
+    sampled = [points[0]]
+    bucket_size = (len(points) - 2) / (threshold - 2)
+    selected = 0
+
+    for bucket in range(threshold - 2):
+        next_start = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, len(points))
+        avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        range_start = int(bucket * bucket_size) + 1
+        range_end = next_start
+        point_x, point_y = xs[selected], ys[selected]
+
+        best_area = -1.0
+        best_index = range_start
+        for index in range(range_start, range_end):
+            area = abs(
+                (point_x - avg_x) * (ys[index] - point_y)
+                - (point_x - xs[index]) * (avg_y - point_y)
+            )
+            if area > best_area:
+                best_area = area
+                best_index = index
+
+        sampled.append(points[best_index])
+        selected = best_index
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def _to_number(value: date | datetime | float) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return float(value.toordinal())
+    return float(value)
@@ -0,0 +1,122 @@
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+from celery import current_app
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from core.models import BackgroundTask
+from games.fake_steam import FakeSteamConfig, FakeSteamServer
+from games.models import Game, PlaytimeSummary, SteamSyncWatermark, StoreDetails
+from games.tasks import import_steam_games
+
+BENCHMARK_STEAM_ID = '76561190000000000'
+
+
+class Command(BaseCommand):
+    help = (
+        'Run import_steam_games end to end against the bundled fake Steam server '
+        'for synthetic libraries of the given sizes. Everything runs eagerly in this '
+        'process on a throwaway test database. Each size is imported twice: "cold" '
+        'with an empty store cache and "warm" re-importing the same library. '
+        'Imports normally leave store details to the refresh scheduler; here they are '
+        'fetched inline (STORE_DETAILS_IMPORT_CACHE_ONLY off) so the fetch path is measured too. '
+        'Reports wall time, HTTP calls, DB queries and peak traced Python memory.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='100,1000,10000', help='Comma-separated library sizes')
+        parser.add_argument('--latency', type=float, default=0.005, help='Fake server latency in seconds')
+        parser.add_argument('--rate-limit', type=float, default=0.0, help='Fake server appdetails requests/s')
+        parser.add_argument('--failure-rate', type=float, default=0.0)
+        parser.add_argument('--client-rate', type=float, default=500.0, help='Client token bucket rate')
+        parser.add_argument('--client-burst', type=int, default=50)
+
+    def handle(self, *args, **kwargs):
+        try:
+            sizes = [int(size) for size in kwargs['sizes'].split(',')]
+        except ValueError:
+            raise CommandError('--sizes must be a comma-separated list of integers')
+
+        eager_settings = {
+            'task_always_eager': current_app.conf.task_always_eager,
+            'task_eager_propagates': current_app.conf.task_eager_propagates,
+        }
+        current_app.conf.update(task_always_eager=True, task_eager_propagates=True)
+
+        with tempfile.TemporaryDirectory() as scratch_dir:
+            if connection.vendor == 'sqlite':
+                connection.settings_dict['TEST']['NAME'] = str(Path(scratch_dir) / 'benchmark.sqlite3')
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+            try:
+                user = get_user_model().objects.create(username='import-benchmark')
+                self.stdout.write(
+                    f'{"games":>7} {"run":>5} {"wall s":>8} {"games/s":>9} {"http":>7} '
+                    f'{"429":>5} {"5xx":>5} {"queries":>8} {"peak MB":>8}  status'
+                )
+                for size in sizes:
+                    self._benchmark_size(size, user, kwargs)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                current_app.conf.update(**eager_settings)
+
+    def _benchmark_size(self, size: int, user, options: dict):
+        config = FakeSteamConfig(
+            game_count=size,
+            latency=options['latency'],
+            rate_limit=options['rate_limit'],
+            failure_rate=options['failure_rate'],
+        )
+
+        with FakeSteamServer(config) as server, override_settings(
+            STEAM_API_URL=server.api_url,
+            STEAM_STORE_URL=server.store_url,
+            STORE_DETAILS_RATE=options['client_rate'],
+            STORE_DETAILS_BURST=options['client_burst'],
+            STORE_DETAILS_IMPORT_CACHE_ONLY=False,
+        ):
+            for run in ('cold', 'warm'):
+                self._run_import(size, run, server, user)
+
+        Game.objects.all().delete()
+        StoreDetails.objects.all().delete()
+        PlaytimeSummary.objects.all().delete()
+        SteamSyncWatermark.objects.all().delete()
+
+    def _run_import(self, size: int, run: str, server: FakeSteamServer, user):
+        db_task = BackgroundTask.objects.create(
+            user=user,
+            task_id=str(uuid.uuid4()),
+            task_name='STEAM_GAMES_IMPORT_BENCHMARK',
+        )
+        server.reset_stats()
+        query_count = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal query_count
+            query_count += 1
+            return execute(sql, params, many, context)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        with connection.execute_wrapper(count_queries):
+            import_steam_games.apply(
+                args=(BENCHMARK_STEAM_ID, 'benchmark', db_task.id),
+                kwargs={'incremental': False},
+            )
+        elapsed = time.perf_counter() - started
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        db_task.refresh_from_db(fields=['status'])
+        self.stdout.write(
+            f'{size:>7} {run:>5} {elapsed:>8.2f} {size / elapsed:>9.1f} {server.stats["requests"]:>7} '
+            f'{server.stats["rate_limited"]:>5} {server.stats["failures"]:>5} {query_count:>8} '
+            f'{peak_memory / 1024 / 1024:>8.1f}  {db_task.status}'
+        )
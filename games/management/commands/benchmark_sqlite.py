@@ -0,0 +1,162 @@
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from games.models import Game
+
+DEFAULT_PROFILE = {'journal_mode': 'DELETE', 'synchronous': 'FULL'}
+DEFAULT_TIMEOUT = 5
+# Stored in the database file; switching it needs an exclusive lock, so it is set
+# once on the copy instead of on every benchmark connection.
+DATABASE_PRAGMAS = ('journal_mode',)
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure how library reads behave while an import is writing. '
+        'The configured database is copied into a scratch file once per profile; '
+        'a writer thread then commits import-sized batches while reader threads run the '
+        'game list query. The "default" profile is stock SQLite (rollback journal), '
+        'the "tuned" profile uses SQLITE_PRAGMAS and the busy timeout from settings. '
+        'With the tuned profile readers should show no lock errors and flat latency, '
+        'because WAL lets them read the last committed snapshot while the writer works. '
+        'Run it after migrate, e.g.: manage.py benchmark_sqlite --readers 8 --duration 10'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per profile')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per write transaction')
+
+    def handle(self, *args, **kwargs):
+        if connection.vendor != 'sqlite':
+            raise CommandError('This benchmark only applies to the SQLite backend.')
+
+        sql, params = Game.objects.for_list().order_by('-playtime', 'pk')[:50].query.sql_with_params()
+        tuned_timeout = settings.DATABASES['default'].get('OPTIONS', {}).get('timeout', DEFAULT_TIMEOUT)
+        profiles = {
+            'default': (DEFAULT_PROFILE, DEFAULT_TIMEOUT),
+            'tuned': (settings.SQLITE_PRAGMAS, tuned_timeout),
+        }
+
+        with tempfile.TemporaryDirectory() as scratch_dir:
+            for name, (pragmas, timeout) in profiles.items():
+                path = Path(scratch_dir) / f'{name}.sqlite3'
+                self._copy_database(path, pragmas)
+                stats = self._run_profile(path, pragmas, timeout, (sql, params), kwargs)
+                self._report(name, stats, kwargs['duration'])
+
+    def _copy_database(self, path: Path, pragmas: dict):
+        connection.ensure_connection()
+        target = sqlite3.connect(path)
+        try:
+            connection.connection.backup(target)
+            target.execute('CREATE TABLE benchmark_write (id INTEGER PRIMARY KEY, payload TEXT)')
+            target.commit()
+            for pragma in DATABASE_PRAGMAS:
+                if pragma in pragmas:
+                    target.execute(f'PRAGMA {pragma}={pragmas[pragma]}')
+        finally:
+            target.close()
+
+    def _connect(self, path: Path, pragmas: dict, timeout: float) -> sqlite3.Connection:
+        db = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        try:
+            for pragma, value in pragmas.items():
+                if pragma not in DATABASE_PRAGMAS:
+                    db.execute(f'PRAGMA {pragma}={value}')
+        except sqlite3.Error:
+            db.close()
+            raise
+        return db
+
+    def _run_profile(self, path: Path, pragmas: dict, timeout: float, query: tuple, options: dict) -> dict:
+        stop = threading.Event()
+        latencies = []
+        stats = {'reads': 0, 'read_errors': 0, 'rows_written': 0, 'write_errors': 0, 'connect_errors': 0}
+        lock = threading.Lock()
+
+        def connect() -> sqlite3.Connection | None:
+            try:
+                return self._connect(path, pragmas, timeout)
+            except sqlite3.Error:
+                with lock:
+                    stats['connect_errors'] += 1
+                return None
+
+        def read_loop():
+            db = connect()
+            if db is None:
+                return
+            try:
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    try:
+                        db.execute(*query).fetchall()
+                    except sqlite3.OperationalError:
+                        with lock:
+                            stats['read_errors'] += 1
+                        continue
+                    with lock:
+                        latencies.append(time.perf_counter() - started)
+                        stats['reads'] += 1
+            finally:
+                db.close()
+
+        def write_loop():
+            db = connect()
+            if db is None:
+                return
+            payload = 'x' * 1024
+            try:
+                while not stop.is_set():
+                    try:
+                        db.execute('BEGIN IMMEDIATE')
+                        db.executemany(
+                            'INSERT INTO benchmark_write (payload) VALUES (?)',
+                            [(payload,)] * options['batch_size']
+                        )
+                        db.execute('COMMIT')
+                        stats['rows_written'] += options['batch_size']
+                    except sqlite3.OperationalError:
+                        stats['write_errors'] += 1
+                        if db.in_transaction:
+                            db.execute('ROLLBACK')
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=write_loop)]
+        threads += [threading.Thread(target=read_loop) for _ in range(options['readers'])]
+        for thread in threads:
+            thread.start()
+        time.sleep(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        stats['latencies'] = sorted(latencies)
+        return stats
+
+    def _report(self, name: str, stats: dict, duration: float):
+        latencies = stats['latencies']
+        if latencies:
+            p50 = statistics.median(latencies) * 1000
+            p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+            worst = latencies[-1] * 1000
+        else:
+            p50 = p95 = worst = 0.0
+
+        self.stdout.write(
+            f'{name:>8}: {stats["reads"] / duration:8.1f} reads/s  '
+            f'p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  max {worst:8.2f} ms  '
+            f'read errors {stats["read_errors"]}  '
+            f'{stats["rows_written"] / duration:9.1f} rows/s written  write errors {stats["write_errors"]}  '
+            f'connect errors {stats["connect_errors"]}'
+        )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from games.constants import GAME_ACTIVITY_PRUNE_BATCH_SIZE, GAME_ACTIVITY_RETENTION_DAYS
+from games.db_services import GameDBService
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete raw game activity older than the retention window. '
+        'Playtime history for those days stays available through the rollups.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=GAME_ACTIVITY_RETENTION_DAYS)
+        parser.add_argument('--batch-size', type=int, default=GAME_ACTIVITY_PRUNE_BATCH_SIZE)
+
+    def handle(self, *args, **kwargs):
+        deleted = GameDBService.prune_activity(
+            retention_days=kwargs['days'],
+            batch_size=kwargs['batch_size'],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Deleted {deleted} game activities older than {kwargs["days"]} days.')
+        )
@@ -0,0 +1,38 @@
+import sys
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from games.exports import EXPORT_DATASETS, EXPORT_FORMATS, iter_export_chunks
+
+
+class Command(BaseCommand):
+    help = 'Stream games or game activity to a CSV, JSON Lines or columnar JSON file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=EXPORT_DATASETS)
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+        parser.add_argument('--fields', help='Comma-separated list of fields to export')
+        parser.add_argument('--start', type=date.fromisoformat, help='First day to include (YYYY-MM-DD)')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last day to include (YYYY-MM-DD)')
+        parser.add_argument('--output', help='Output file, stdout when omitted')
+
+    def handle(self, *args, **kwargs):
+        fields = [field for field in (kwargs['fields'] or '').split(',') if field]
+        chunks = iter_export_chunks(
+            kwargs['dataset'],
+            kwargs['format'],
+            fields,
+            start=kwargs['start'],
+            end=kwargs['end'],
+        )
+
+        output = open(kwargs['output'], 'w', newline='', encoding='utf-8') if kwargs['output'] else sys.stdout
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+        except ValueError as e:
+            raise CommandError(e)
+        finally:
+            if output is not sys.stdout:
+                output.close()
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from games.fake_steam import FakeSteamConfig, FakeSteamServer
+
+
+class Command(BaseCommand):
+    help = (
+        'Serve a local stand-in for the Steam GetOwnedGames and appdetails endpoints. '
+        'Point STEAM_API_URL and STEAM_STORE_URL settings at the printed URLs.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--games', type=int, default=1000, help='Size of the synthetic library')
+        parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+        parser.add_argument('--latency-jitter', type=float, default=0.0)
+        parser.add_argument('--rate-limit', type=float, default=0.0, help='appdetails requests/s before 429s')
+        parser.add_argument('--failure-rate', type=float, default=0.0, help='Share of appdetails calls that fail')
+        parser.add_argument('--unlisted-rate', type=float, default=0.0, help='Share of apps without store data')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **kwargs):
+        server = FakeSteamServer(
+            FakeSteamConfig(
+                game_count=kwargs['games'],
+                latency=kwargs['latency'],
+                latency_jitter=kwargs['latency_jitter'],
+                rate_limit=kwargs['rate_limit'],
+                failure_rate=kwargs['failure_rate'],
+                unlisted_rate=kwargs['unlisted_rate'],
+                seed=kwargs['seed'],
+            ),
+            port=kwargs['port'],
+        )
+
+        self.stdout.write(f'STEAM_API_URL={server.api_url}')
+        self.stdout.write(f'STEAM_STORE_URL={server.store_url}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stdout.write(f'Served: {dict(server.stats)}')
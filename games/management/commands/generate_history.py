@@ -4,7 +4,8 @@ from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
-from games.models import Game, GameActivity
+from games.cache import bump_data_version
+from games.models import Game, GameActivity, GameActivityRollup, PlaytimeSummary
 
 
 class Command(BaseCommand):
@@ -46,3 +47,7 @@ class Command(BaseCommand):
 
         if game_activities:
             GameActivity.objects.bulk_create(game_activities, batch_size=500)
+
+        GameActivityRollup.rebuild()
+        PlaytimeSummary.rebuild()
+        bump_data_version()
@@ -1,14 +1,35 @@
 import os
+from pathlib import Path
 
-from db_services import GameDBService
-from django.core.management.base import BaseCommand
-from services import SteamGameService
+from django.core.management.base import BaseCommand, CommandError
+
+from games.constants import GAMES_SAVE_BATCH_SIZE
+from games.db_services import GameDBService
+from games.services import SteamGameService
+from games.snapshots import SnapshotGameService
 
 
 class Command(BaseCommand):
-    help = 'Import your game library from Steam API and save it to the database.'
+    help = (
+        'Import your game library from Steam API and save it to the database. '
+        'With --snapshot, read saved GetOwnedGames and appdetails dumps instead '
+        '(.json, .jsonl, optionally gzip\'d, or directories of them).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--snapshot',
+            action='append',
+            type=Path,
+            help='Snapshot file or directory; can be given several times'
+        )
+        parser.add_argument('--batch-size', type=int, default=GAMES_SAVE_BATCH_SIZE)
 
     def handle(self, *args, **kwargs):
+        if kwargs['snapshot']:
+            self._import_snapshots(kwargs['snapshot'], kwargs['batch_size'])
+            return
+
         api_key = os.getenv('STEAM_API_KEY')
         steam_id = os.getenv('STEAM_ID')
 
@@ -34,7 +55,33 @@ class Command(BaseCommand):
         self.stdout.write(f'Found {len(owned_games)} games. Starting import...')
 
         success_count, error_count = GameDBService.save_games(owned_games)
+        self._report(success_count, error_count)
+
+    def _import_snapshots(self, paths: list[Path], batch_size: int):
+        snapshot_service = SnapshotGameService(paths)
+
+        try:
+            loaded = snapshot_service.load_store_details()
+            self.stdout.write(f'Loaded {loaded} store details. Starting import...')
+
+            processed = 0
+
+            def report_batch(batch_count: int, errors: int):
+                nonlocal processed
+                processed += batch_count
+                self.stdout.write(f'Processed {processed} games...')
+
+            success_count, error_count = GameDBService.save_games_stream(
+                snapshot_service.iter_enriched_games(snapshot_service.iter_owned_games()),
+                batch_size=batch_size,
+                on_batch=report_batch,
+            )
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Failed to read snapshot: {e}')
+
+        self._report(success_count, error_count)
 
+    def _report(self, success_count: int, error_count: int):
         self.stdout.write(
             self.style.SUCCESS(f'Successfully imported {success_count} games.')
         )
@@ -0,0 +1,31 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from games.cache import bump_data_version
+from games.constants import GAME_ACTIVITY_RETENTION_DAYS
+from games.models import GameActivityRollup
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild daily, weekly and monthly playtime rollups from game activity history. '
+        'Only buckets inside the activity retention window are rebuilt unless --full is given, '
+        'because older raw activity may already have been compacted away.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=date.fromisoformat, help='Rebuild buckets starting on or after this date')
+        parser.add_argument('--full', action='store_true', help='Drop and rebuild every rollup bucket')
+
+    def handle(self, *args, **kwargs):
+        since = kwargs['since']
+        if since is None and not kwargs['full']:
+            since = timezone.localdate() - timedelta(days=GAME_ACTIVITY_RETENTION_DAYS)
+
+        created = GameActivityRollup.rebuild(since=None if kwargs['full'] else since)
+        bump_data_version()
+        self.stdout.write(
+            self.style.SUCCESS(f'Created {created} rollup buckets.')
+        )
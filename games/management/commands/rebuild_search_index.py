@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from games.cache import bump_data_version
+from games.search import GameSearchIndex
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for the game library.'
+
+    def handle(self, *args, **kwargs):
+        indexed = GameSearchIndex.rebuild()
+        bump_data_version()
+        self.stdout.write(
+            self.style.SUCCESS(f'Indexed {indexed} games.')
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from games.constants import STORE_REFRESH_BUDGET
+from games.db_services import GameDBService
+from games.services import SteamGameService
+from games.store_refresh import StoreRefreshScheduler
+
+
+class Command(BaseCommand):
+    help = (
+        'Refresh the most stale store details of played games, ranked by staleness and popularity, '
+        'and apply them to the library. Runs on a Celery beat schedule; use this to run a batch by hand.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budget', type=int, default=STORE_REFRESH_BUDGET, help='Apps to refresh')
+        parser.add_argument('--dry-run', action='store_true', help='Only list the apps that would be refreshed')
+
+    def handle(self, *args, **kwargs):
+        app_ids = StoreRefreshScheduler().next_batch(kwargs['budget'])
+
+        if kwargs['dry_run']:
+            self.stdout.write('\n'.join(app_ids))
+            return
+
+        store_details = SteamGameService().refresh_store_details(app_ids)
+        updated = GameDBService.apply_store_details(store_details)
+        self.stdout.write(
+            self.style.SUCCESS(f'Refreshed {len(app_ids)} apps, updated {updated} games.')
+        )
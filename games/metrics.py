@@ -0,0 +1,200 @@
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+from .constants import METRICS_DURATION_BUCKETS, METRICS_N_PLUS_ONE_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+IN_LIST_RE = re.compile(r'\((?:%s, )+%s\)')
+NUMBER_RE = re.compile(r'\b\d+\b')
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = METRICS_DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> list[int]:
+        total = 0
+        cumulative = []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._histograms = {}
+        self._help = {}
+
+    def inc(self, name: str, value: float = 1, help_text: str = '', **labels: str):
+        with self._lock:
+            self._help.setdefault(name, help_text)
+            self._counters[(name, tuple(sorted(labels.items())))] += value
+
+    def observe(self, name: str, value: float, help_text: str = '', **labels: str):
+        with self._lock:
+            self._help.setdefault(name, help_text)
+            key = (name, tuple(sorted(labels.items())))
+            if key not in self._histograms:
+                self._histograms[key] = Histogram()
+            self._histograms[key].observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+
+            for name in sorted({name for (name, _), _ in counters}):
+                lines += self._header(name, 'counter')
+                lines += [
+                    f'{name}{_format_labels(labels)} {value:g}'
+                    for (counter_name, labels), value in counters
+                    if counter_name == name
+                ]
+
+            for name in sorted({name for (name, _), _ in histograms}):
+                lines += self._header(name, 'histogram')
+                for (histogram_name, labels), histogram in histograms:
+                    if histogram_name != name:
+                        continue
+                    for bucket, count in zip(histogram.buckets, histogram.cumulative_counts()):
+                        lines.append(f'{name}_bucket{_format_labels(labels + (("le", f"{bucket:g}"),))} {count}')
+                    lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {histogram.count}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {histogram.sum:g}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {histogram.count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def _header(self, name: str, metric_type: str) -> list[str]:
+        header = [f'# TYPE {name} {metric_type}']
+        if self._help.get(name):
+            header.insert(0, f'# HELP {name} {self._help[name]}')
+        return header
+
+
+registry = MetricsRegistry()
+
+
+@dataclass
+class RequestMetrics:
+    queries: int = 0
+    db_time: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    render_time: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+
+_current_request = ContextVar('games_request_metrics', default=None)
+
+
+def start_request() -> tuple[RequestMetrics, object]:
+    metrics = RequestMetrics()
+    return metrics, _current_request.set(metrics)
+
+
+def finish_request(token):
+    _current_request.reset(token)
+
+
+def record_cache_lookup(hit: bool):
+    metrics = _current_request.get()
+    if metrics is None:
+        return
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
+
+
+class QueryRecorder:
+    def __init__(self, metrics: RequestMetrics):
+        self.metrics = metrics
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.metrics.db_time += time.perf_counter() - started
+            self.metrics.queries += 1
+            self.metrics.statements[normalize_sql(sql)] += 1
+
+
+def normalize_sql(sql: str) -> str:
+    return NUMBER_RE.sub('N', IN_LIST_RE.sub('(%s, ...)', sql))
+
+
+def report_request(view: str, method: str, status: int, duration: float, metrics: RequestMetrics):
+    registry.inc('games_requests_total', help_text='Requests served', view=view, status=str(status))
+    registry.observe('games_request_duration_seconds', duration, help_text='Request latency', view=view)
+    registry.inc('games_db_queries_total', metrics.queries, help_text='SQL queries executed', view=view)
+    registry.inc('games_db_time_seconds_total', metrics.db_time, help_text='Time spent in SQL', view=view)
+    registry.inc('games_cache_hits_total', metrics.cache_hits, help_text='Page cache hits', view=view)
+    registry.inc('games_cache_misses_total', metrics.cache_misses, help_text='Page cache misses', view=view)
+    registry.inc('games_render_seconds_total', metrics.render_time, help_text='Template render time', view=view)
+
+    threshold = getattr(settings, 'GAMES_METRICS_N_PLUS_ONE_THRESHOLD', METRICS_N_PLUS_ONE_THRESHOLD)
+    for sql, count in metrics.statements.most_common():
+        if count < threshold:
+            break
+        registry.inc('games_n_plus_one_total', help_text='Repeated SQL statements per request', view=view)
+        logger.warning(f'Possible N+1 in {view}: {count} executions of {sql[:300]}')
+
+    budget = getattr(settings, 'GAMES_METRICS_QUERY_BUDGETS', {}).get(view)
+    if budget is not None and metrics.queries > budget:
+        logger.warning(f'{view} ran {metrics.queries} queries, over its budget of {budget}')
+
+    logger.info(
+        f'request view={view} method={method} status={status} duration_ms={duration * 1000:.1f} '
+        f'queries={metrics.queries} db_ms={metrics.db_time * 1000:.1f} '
+        f'cache_hits={metrics.cache_hits} cache_misses={metrics.cache_misses} '
+        f'render_ms={metrics.render_time * 1000:.1f}',
+        extra={
+            'view': view,
+            'status': status,
+            'duration': duration,
+            'queries': metrics.queries,
+            'db_time': metrics.db_time,
+            'cache_hits': metrics.cache_hits,
+            'cache_misses': metrics.cache_misses,
+            'render_time': metrics.render_time,
+        }
+    )
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in labels) + '}'
+
+
+def _escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
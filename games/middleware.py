@@ -0,0 +1,35 @@
+import time
+
+from django.db import connection
+
+from .metrics import QueryRecorder, finish_request, report_request, start_request
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics, token = start_request()
+        request.games_metrics = metrics
+        started = time.perf_counter()
+
+        try:
+            with connection.execute_wrapper(QueryRecorder(metrics)):
+                response = self.get_response(request)
+        finally:
+            finish_request(token)
+
+        view = request.resolver_match.view_name if request.resolver_match else 'unresolved'
+        report_request(view, request.method, response.status_code, time.perf_counter() - started, metrics)
+        return response
+
+    def process_template_response(self, request, response):
+        metrics = request.games_metrics
+        render_started = time.perf_counter()
+
+        def record_render_time(rendered_response):
+            metrics.render_time += time.perf_counter() - render_started
+
+        response.add_post_render_callback(record_render_time)
+        return response
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.2 on 2026-10-18 17:58
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoreDetails',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('app_id', models.CharField(max_length=255, unique=True, verbose_name='app ID')),
+                ('data', models.JSONField(default=dict, verbose_name='store appdetails data')),
+                ('success', models.BooleanField(default=True)),
+                ('etag', models.CharField(blank=True, max_length=255)),
+                ('last_modified', models.CharField(blank=True, max_length=64)),
+                ('expires_at', models.DateTimeField()),
+                ('accessed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'store details',
+                'verbose_name_plural': 'store details',
+                'indexes': [models.Index(fields=['expires_at'], name='games_store_expires_e8863e_idx'), models.Index(fields=['accessed_at'], name='games_store_accesse_7c193e_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-18 17:59
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0002_storedetails'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SteamSyncWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('steam_id', models.CharField(max_length=255, unique=True, verbose_name='Steam ID')),
+                ('last_synced_at', models.DateTimeField(blank=True, null=True)),
+                ('last_played_at', models.PositiveBigIntegerField(default=0, verbose_name='latest rtime_last_played seen')),
+            ],
+            options={
+                'verbose_name': 'Steam sync watermark',
+                'verbose_name_plural': 'Steam sync watermarks',
+            },
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 6.0.2 on 2026-10-18 18:03
+
+from django.db import migrations, models
+
+from games.normalizers import extract_promoted_fields
+
+BACKFILL_BATCH_SIZE = 500
+PROMOTED_FIELDS = ['rtime_last_played', 'playtime_2weeks', 'short_description', 'genres', 'release_date']
+
+
+def backfill_promoted_fields(apps, schema_editor):
+    Game = apps.get_model('games', 'Game')
+    batch = []
+
+    for game in Game.objects.only('id', 'raw_data').iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        for field, value in extract_promoted_fields(game.raw_data or {}).items():
+            setattr(game, field, value)
+        batch.append(game)
+
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            Game.objects.bulk_update(batch, PROMOTED_FIELDS)
+            batch = []
+
+    if batch:
+        Game.objects.bulk_update(batch, PROMOTED_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0003_steamsyncwatermark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='genres',
+            field=models.CharField(blank=True, max_length=255, verbose_name='genres'),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='playtime_2weeks',
+            field=models.PositiveIntegerField(default=0, verbose_name='playtime in the last two weeks (minutes)'),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='release_date',
+            field=models.DateField(blank=True, null=True, verbose_name='release date'),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='rtime_last_played',
+            field=models.PositiveBigIntegerField(default=0, verbose_name='last played (unix time)'),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='short_description',
+            field=models.TextField(blank=True, verbose_name='short description'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['rtime_last_played'], name='games_game_rtime_l_5cd708_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['playtime_2weeks'], name='games_game_playtim_2565ef_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['genres'], name='games_game_genres_0c360f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['release_date'], name='games_game_release_b822ea_idx'),
+        ),
+        migrations.RunPython(backfill_promoted_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations
+
+FTS_TABLE = 'games_game_fts'
+BACKFILL_BATCH_SIZE = 500
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    Game = apps.get_model('games', 'Game')
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+        f"name, short_description, genres, developers, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+
+    rows = []
+    games = Game.objects.only('id', 'name', 'short_description', 'genres', 'raw_data')
+    with schema_editor.connection.cursor() as cursor:
+        for game in games.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+            developers = ', '.join((game.raw_data or {}).get('developers') or [])
+            rows.append((game.id, game.name, game.short_description, game.genres, developers))
+
+            if len(rows) >= BACKFILL_BATCH_SIZE:
+                cursor.executemany(
+                    f'INSERT INTO {FTS_TABLE} (rowid, name, short_description, genres, developers) '
+                    f'VALUES (%s, %s, %s, %s, %s)',
+                    rows
+                )
+                rows = []
+
+        if rows:
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, short_description, genres, developers) '
+                f'VALUES (%s, %s, %s, %s, %s)',
+                rows
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0004_promote_raw_data_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
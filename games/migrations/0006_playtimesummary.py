@@ -0,0 +1,59 @@
+# Generated by Django 6.0.2 on 2026-10-18 18:06
+
+from datetime import timedelta
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def build_playtime_summary(apps, schema_editor):
+    GameActivity = apps.get_model('games', 'GameActivity')
+    PlaytimeSummary = apps.get_model('games', 'PlaytimeSummary')
+
+    stats = GameActivity.objects.aggregate(
+        total_playtime=models.Sum('playtime'),
+        session_count=models.Count('id'),
+    )
+    longest = GameActivity.objects.order_by('-playtime').first()
+    month_ago = timezone.now() - timedelta(days=30)
+
+    PlaytimeSummary.objects.create(
+        pk=1,
+        total_playtime=stats['total_playtime'] or 0,
+        session_count=stats['session_count'],
+        longest_session=longest.playtime if longest else 0,
+        longest_session_game_id=longest.game_id if longest else None,
+        games_last_month=GameActivity.objects.filter(
+            created_at__gte=month_ago
+        ).values('game').distinct().count(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0005_game_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlaytimeSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('total_playtime', models.PositiveBigIntegerField(default=0, verbose_name='total playtime (minutes)')),
+                ('session_count', models.PositiveIntegerField(default=0)),
+                ('longest_session', models.PositiveIntegerField(default=0, verbose_name='longest session (minutes)')),
+                ('games_last_month', models.PositiveIntegerField(default=0)),
+                ('longest_session_game', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='games.game')),
+            ],
+            options={
+                'verbose_name': 'playtime summary',
+                'verbose_name_plural': 'playtime summary',
+            },
+        ),
+        migrations.RunPython(build_playtime_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 6.0.2 on 2026-10-18 18:06
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_rollups(apps, schema_editor):
+    GameActivity = apps.get_model('games', 'GameActivity')
+    GameActivityRollup = apps.get_model('games', 'GameActivityRollup')
+    truncations = {
+        'day': TruncDay('created_at'),
+        'week': TruncWeek('created_at'),
+        'month': TruncMonth('created_at'),
+    }
+
+    for period, truncation in truncations.items():
+        buckets = (
+            GameActivity.objects
+            .order_by()
+            .annotate(bucket=truncation)
+            .values('game_id', 'bucket')
+            .annotate(total=models.Sum('playtime'), count=models.Count('id'))
+        )
+        rollups = []
+        for bucket in buckets.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+            rollups.append(GameActivityRollup(
+                game_id=bucket['game_id'],
+                period=period,
+                bucket_start=bucket['bucket'].date(),
+                playtime=bucket['total'],
+                sessions=bucket['count'],
+            ))
+            if len(rollups) >= BACKFILL_BATCH_SIZE:
+                GameActivityRollup.objects.bulk_create(rollups)
+                rollups = []
+        GameActivityRollup.objects.bulk_create(rollups)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0006_playtimesummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameActivityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], max_length=5)),
+                ('bucket_start', models.DateField()),
+                ('playtime', models.PositiveIntegerField(default=0, verbose_name='Playtime (minutes)')),
+                ('sessions', models.PositiveIntegerField(default=0)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='games.game', verbose_name='Game')),
+            ],
+            options={
+                'verbose_name': 'game activity rollup',
+                'verbose_name_plural': 'game activity rollups',
+                'ordering': ('bucket_start',),
+                'constraints': [models.UniqueConstraint(fields=('game', 'period', 'bucket_start'), name='unique_game_activity_rollup_bucket')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0.2 on 2026-10-18 18:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_backgroundtask_progress'),
+        ('games', '0007_gameactivityrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportStageMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('stage', models.CharField(choices=[('fetch_owned', 'Owned games fetch'), ('store_details', 'Store details call'), ('rate_limit_wait', 'Rate limit wait'), ('normalize', 'Normalization'), ('db_write', 'DB write batch'), ('chunk', 'Import chunk')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total_time', models.FloatField(default=0.0, verbose_name='total time (seconds)')),
+                ('max_time', models.FloatField(default=0.0, verbose_name='slowest (seconds)')),
+                ('rows', models.PositiveIntegerField(default=0)),
+                ('retries', models.PositiveIntegerField(default=0)),
+                ('bucket_counts', models.JSONField(blank=True, default=list)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stage_metrics', to='core.backgroundtask')),
+            ],
+            options={
+                'verbose_name': 'import stage metric',
+                'verbose_name_plural': 'import stage metrics',
+                'ordering': ('task', 'stage'),
+                'constraints': [models.UniqueConstraint(fields=('task', 'stage'), name='unique_import_stage_metric')],
+            },
+        ),
+    ]
@@ -0,0 +1,130 @@
+# Generated by Django 6.0.2 on 2026-10-18 21:40
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+# Imports that predate delta tracking stored GameActivity.playtime as a snapshot of
+# the game's cumulative playtime in hours instead of a session length in minutes.
+# The first migration shipped with the delta-writing import marks the cutover.
+CUTOVER_MIGRATION = ('games', '0003_steamsyncwatermark')
+
+
+def _legacy_cutoff(schema_editor):
+    app, name = CUTOVER_MIGRATION
+    recorder = MigrationRecorder(schema_editor.connection)
+    applied = recorder.migration_qs.filter(app=app, name=name).values_list('applied', flat=True).first()
+    return applied or timezone.now()
+
+
+def convert_legacy_activity(apps, schema_editor):
+    GameActivity = apps.get_model('games', 'GameActivity')
+    legacy = (
+        GameActivity.objects
+        .filter(created_at__lt=_legacy_cutoff(schema_editor))
+        .order_by('game_id', 'created_at', 'id')
+        .values_list('id', 'game_id', 'playtime')
+    )
+
+    converted = False
+    previous_game_id = previous_hours = None
+    updates, deletes = [], []
+
+    for activity_id, game_id, hours in list(legacy):
+        converted = True
+        # The first snapshot of a game has no baseline to diff against.
+        delta = (hours - previous_hours) * 60 if game_id == previous_game_id else 0
+        previous_game_id, previous_hours = game_id, hours
+
+        if delta > 0:
+            updates.append(GameActivity(id=activity_id, playtime=delta))
+        else:
+            deletes.append(activity_id)
+
+        if len(updates) >= BATCH_SIZE:
+            GameActivity.objects.bulk_update(updates, ['playtime'])
+            updates = []
+        if len(deletes) >= BATCH_SIZE:
+            GameActivity.objects.filter(id__in=deletes).delete()
+            deletes = []
+
+    GameActivity.objects.bulk_update(updates, ['playtime'])
+    GameActivity.objects.filter(id__in=deletes).delete()
+
+    if converted:
+        _rebuild_rollups(apps)
+        _rebuild_summary(apps)
+
+
+def _rebuild_rollups(apps):
+    GameActivity = apps.get_model('games', 'GameActivity')
+    GameActivityRollup = apps.get_model('games', 'GameActivityRollup')
+    truncations = {
+        'day': TruncDay('created_at'),
+        'week': TruncWeek('created_at'),
+        'month': TruncMonth('created_at'),
+    }
+
+    GameActivityRollup.objects.all().delete()
+    for period, truncation in truncations.items():
+        buckets = (
+            GameActivity.objects
+            .order_by()
+            .annotate(bucket=truncation)
+            .values('game_id', 'bucket')
+            .annotate(total=models.Sum('playtime'), count=models.Count('id'))
+        )
+        rollups = []
+        for bucket in buckets.iterator(chunk_size=BATCH_SIZE):
+            rollups.append(GameActivityRollup(
+                game_id=bucket['game_id'],
+                period=period,
+                bucket_start=bucket['bucket'].date(),
+                playtime=bucket['total'],
+                sessions=bucket['count'],
+            ))
+            if len(rollups) >= BATCH_SIZE:
+                GameActivityRollup.objects.bulk_create(rollups)
+                rollups = []
+        GameActivityRollup.objects.bulk_create(rollups)
+
+
+def _rebuild_summary(apps):
+    GameActivity = apps.get_model('games', 'GameActivity')
+    PlaytimeSummary = apps.get_model('games', 'PlaytimeSummary')
+
+    stats = GameActivity.objects.aggregate(
+        total_playtime=models.Sum('playtime'),
+        session_count=models.Count('id'),
+    )
+    longest = GameActivity.objects.order_by('-playtime').first()
+    month_ago = timezone.now() - timedelta(days=30)
+
+    PlaytimeSummary.objects.update_or_create(
+        pk=1,
+        defaults={
+            'total_playtime': stats['total_playtime'] or 0,
+            'session_count': stats['session_count'],
+            'longest_session': longest.playtime if longest else 0,
+            'longest_session_game_id': longest.game_id if longest else None,
+            'games_last_month': GameActivity.objects.filter(
+                created_at__gte=month_ago
+            ).values('game').distinct().count(),
+        }
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0008_importstagemetric'),
+    ]
+
+    operations = [
+        migrations.RunPython(convert_legacy_activity, migrations.RunPython.noop),
+    ]
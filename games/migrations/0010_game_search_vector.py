@@ -0,0 +1,40 @@
+from django.db import migrations
+
+SEARCH_VECTOR_COLUMN = 'search_vector'
+SEARCH_VECTOR_INDEX = 'games_game_search_vector_idx'
+
+
+def create_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(
+        f'ALTER TABLE games_game ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR_COLUMN} tsvector GENERATED ALWAYS AS ('
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(genres, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(short_description, '')), 'C') || "
+        "setweight(to_tsvector('simple', coalesce(raw_data ->> 'developers', '')), 'D')"
+        ') STORED'
+    )
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {SEARCH_VECTOR_INDEX} ON games_game USING GIN ({SEARCH_VECTOR_COLUMN})'
+    )
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(f'DROP INDEX IF EXISTS {SEARCH_VECTOR_INDEX}')
+    schema_editor.execute(f'ALTER TABLE games_game DROP COLUMN IF EXISTS {SEARCH_VECTOR_COLUMN}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0009_convert_legacy_activity'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_vector, drop_search_vector),
+    ]
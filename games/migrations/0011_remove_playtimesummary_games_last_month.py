@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-18 22:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0010_game_search_vector'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='playtimesummary',
+            name='games_last_month',
+        ),
+    ]
@@ -1,12 +1,25 @@
-from datetime import UTC
+from collections import defaultdict
+from datetime import UTC, date, datetime, time, timedelta
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
 from django.urls import reverse
 from django.utils import timezone
 
-from core.models import TimeStampedModel
+from core.models import BackgroundTask, TimeStampedModel
 
-from .constants import STEAM_HEADER_IMAGE_BASE_URL
+from .constants import IMPORT_TELEMETRY_BUCKETS, STEAM_HEADER_IMAGE_BASE_URL
+
+
+class GameQuerySet(models.QuerySet):
+    LIST_FIELDS = ('id', 'game_id', 'name', 'playtime', 'rtime_last_played')
+    HEAVY_FIELDS = ('raw_data', 'short_description')
+
+    def for_list(self):
+        return self.only(*self.LIST_FIELDS)
+
+    def without_payload(self):
+        return self.defer(*self.HEAVY_FIELDS)
 
 
 class Game(TimeStampedModel):
@@ -14,13 +27,30 @@ class Game(TimeStampedModel):
     name = models.CharField(max_length=255, verbose_name="game name")
     icon_url = models.URLField(blank=True, null=True, verbose_name="icon URL")
     playtime = models.FloatField(default=0.0, verbose_name="playtime (hours)")
+    playtime_2weeks = models.PositiveIntegerField(
+        default=0,
+        verbose_name="playtime in the last two weeks (minutes)"
+    )
+    rtime_last_played = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="last played (unix time)"
+    )
+    short_description = models.TextField(blank=True, verbose_name="short description")
+    genres = models.CharField(max_length=255, blank=True, verbose_name="genres")
+    release_date = models.DateField(blank=True, null=True, verbose_name="release date")
     raw_data = models.JSONField(verbose_name="raw steam JSON")
 
+    objects = GameQuerySet.as_manager()
+
     class Meta:
         ordering = ('-playtime',)
         indexes = (
             models.Index(fields=['playtime']),
             models.Index(fields=['name']),
+            models.Index(fields=['rtime_last_played']),
+            models.Index(fields=['playtime_2weeks']),
+            models.Index(fields=['genres']),
+            models.Index(fields=['release_date']),
         )
         verbose_name = "Game"
         verbose_name_plural = "Games"
@@ -32,13 +62,15 @@ class Game(TimeStampedModel):
         return f'{STEAM_HEADER_IMAGE_BASE_URL}{self.game_id}/header.jpg'
 
     def get_last_played(self):
-        last_played_timestamp = self.raw_data.get('rtime_last_played')
-        if last_played_timestamp:
+        if self.rtime_last_played:
             return timezone.datetime.fromtimestamp(
-                last_played_timestamp, tz=UTC
+                self.rtime_last_played, tz=UTC
             )
         return None
 
+    def get_genre_list(self):
+        return [genre for genre in self.genres.split(', ') if genre]
+
     def __str__(self):
         return f'{self.name} (Playtime: {self.playtime:.1f} hours)'
 
@@ -65,3 +97,333 @@ class GameActivity(TimeStampedModel):
 
     def __str__(self):
         return f"{self.game.name} [{self.created_at.strftime('%Y-%m-%d')}]"
+
+
+class StoreDetails(TimeStampedModel):
+    app_id = models.CharField(max_length=255, unique=True, verbose_name="app ID")
+    data = models.JSONField(default=dict, verbose_name="store appdetails data")
+    success = models.BooleanField(default=True)
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
+    expires_at = models.DateTimeField()
+    accessed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = (
+            models.Index(fields=['expires_at']),
+            models.Index(fields=['accessed_at']),
+        )
+        verbose_name = "store details"
+        verbose_name_plural = "store details"
+
+    @property
+    def is_fresh(self):
+        return self.expires_at > timezone.now()
+
+    def __str__(self):
+        return f'{self.app_id} (expires {self.expires_at:%Y-%m-%d %H:%M})'
+
+
+class SteamSyncWatermark(TimeStampedModel):
+    steam_id = models.CharField(max_length=255, unique=True, verbose_name="Steam ID")
+    last_synced_at = models.DateTimeField(blank=True, null=True)
+    last_played_at = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="latest rtime_last_played seen"
+    )
+
+    class Meta:
+        verbose_name = "Steam sync watermark"
+        verbose_name_plural = "Steam sync watermarks"
+
+    def __str__(self):
+        return f'{self.steam_id} (synced: {self.last_synced_at})'
+
+    @classmethod
+    def advance(cls, steam_id: str, last_played_at: int):
+        watermark, _ = cls.objects.get_or_create(steam_id=steam_id)
+        watermark.last_synced_at = timezone.now()
+        watermark.last_played_at = max(watermark.last_played_at, last_played_at)
+        watermark.save(update_fields=['last_synced_at', 'last_played_at', 'updated_at'])
+
+
+class PlaytimeSummary(TimeStampedModel):
+    total_playtime = models.PositiveBigIntegerField(default=0, verbose_name="total playtime (minutes)")
+    session_count = models.PositiveIntegerField(default=0)
+    longest_session = models.PositiveIntegerField(default=0, verbose_name="longest session (minutes)")
+    longest_session_game = models.ForeignKey(
+        Game,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        verbose_name = "playtime summary"
+        verbose_name_plural = "playtime summary"
+
+    def __str__(self):
+        return f'{self.total_playtime} minutes over {self.session_count} sessions'
+
+    @property
+    def avg_session(self):
+        return self.total_playtime / self.session_count if self.session_count else 0.0
+
+    @classmethod
+    def load(cls):
+        summary, _ = cls.objects.get_or_create(pk=1)
+        return summary
+
+    @classmethod
+    def record_sessions(cls, activities: list['GameActivity']):
+        if not activities:
+            return
+
+        longest = max(activities, key=lambda activity: activity.playtime)
+
+        with transaction.atomic():
+            summary = cls.objects.select_for_update().filter(pk=1).first() or cls.load()
+            summary.total_playtime += sum(activity.playtime for activity in activities)
+            summary.session_count += len(activities)
+            if longest.playtime > summary.longest_session:
+                summary.longest_session = longest.playtime
+                summary.longest_session_game_id = longest.game_id
+            summary.save()
+
+    @classmethod
+    def rebuild(cls):
+        stats = GameActivityRollup.objects.filter(
+            period=GameActivityRollup.Period.MONTH
+        ).aggregate(
+            total_playtime=models.Sum('playtime'),
+            session_count=models.Sum('sessions'),
+        )
+        longest = GameActivity.objects.only('playtime', 'game_id').order_by('-playtime').first()
+
+        cls.objects.update_or_create(
+            pk=1,
+            defaults={
+                'total_playtime': stats['total_playtime'] or 0,
+                'session_count': stats['session_count'] or 0,
+                'longest_session': longest.playtime if longest else 0,
+                'longest_session_game_id': longest.game_id if longest else None,
+            }
+        )
+
+    @staticmethod
+    def count_games_last_month() -> int:
+        month_ago = timezone.now() - timedelta(days=30)
+        return GameActivity.objects.filter(
+            created_at__gte=month_ago
+        ).values('game').distinct().count()
+
+
+class GameActivityRollup(TimeStampedModel):
+    class Period(models.TextChoices):
+        DAY = 'day', 'Day'
+        WEEK = 'week', 'Week'
+        MONTH = 'month', 'Month'
+
+    game = models.ForeignKey(
+        Game,
+        on_delete=models.CASCADE,
+        related_name='rollups',
+        verbose_name="Game"
+    )
+    period = models.CharField(max_length=5, choices=Period.choices)
+    bucket_start = models.DateField()
+    playtime = models.PositiveIntegerField(default=0, verbose_name="Playtime (minutes)")
+    sessions = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ('bucket_start',)
+        constraints = (
+            models.UniqueConstraint(
+                fields=['game', 'period', 'bucket_start'],
+                name='unique_game_activity_rollup_bucket'
+            ),
+        )
+        verbose_name = "game activity rollup"
+        verbose_name_plural = "game activity rollups"
+
+    def __str__(self):
+        return f'{self.game_id} {self.period} {self.bucket_start:%Y-%m-%d}: {self.playtime} min'
+
+    @staticmethod
+    def bucket_for(period: str, day: date) -> date:
+        if period == GameActivityRollup.Period.WEEK:
+            return day - timedelta(days=day.weekday())
+        if period == GameActivityRollup.Period.MONTH:
+            return day.replace(day=1)
+        return day
+
+    @classmethod
+    def record(cls, activities: list['GameActivity']):
+        if not activities:
+            return
+
+        increments = defaultdict(lambda: [0, 0])
+        for activity in activities:
+            day = timezone.localdate(activity.created_at)
+            for period in cls.Period.values:
+                totals = increments[(activity.game_id, period, cls.bucket_for(period, day))]
+                totals[0] += activity.playtime
+                totals[1] += 1
+
+        existing = {
+            (rollup.game_id, rollup.period, rollup.bucket_start): rollup
+            for rollup in cls.objects.filter(
+                game_id__in={game_id for game_id, _, _ in increments},
+                bucket_start__in={bucket for _, _, bucket in increments},
+            )
+        }
+
+        rollups = []
+        for key, (playtime, sessions) in increments.items():
+            current = existing.get(key)
+            game_id, period, bucket_start = key
+            rollups.append(cls(
+                game_id=game_id,
+                period=period,
+                bucket_start=bucket_start,
+                playtime=playtime + (current.playtime if current else 0),
+                sessions=sessions + (current.sessions if current else 0),
+            ))
+
+        cls.objects.bulk_create(
+            rollups,
+            update_conflicts=True,
+            unique_fields=['game', 'period', 'bucket_start'],
+            update_fields=['playtime', 'sessions', 'updated_at'],
+        )
+
+    @staticmethod
+    def first_full_bucket(period: str, day: date) -> date:
+        bucket_start = GameActivityRollup.bucket_for(period, day)
+        if bucket_start == day:
+            return bucket_start
+        if period == GameActivityRollup.Period.WEEK:
+            return bucket_start + timedelta(days=7)
+        return (bucket_start + timedelta(days=32)).replace(day=1)
+
+    @classmethod
+    def rebuild(cls, batch_size: int = 1000, since: date | None = None) -> int:
+        truncations = {
+            cls.Period.DAY: TruncDay('created_at'),
+            cls.Period.WEEK: TruncWeek('created_at'),
+            cls.Period.MONTH: TruncMonth('created_at'),
+        }
+
+        with transaction.atomic():
+            created = 0
+
+            for period, truncation in truncations.items():
+                rollups = cls.objects.filter(period=period)
+                activities = GameActivity.objects.all()
+                if since is not None:
+                    bucket_start = cls.first_full_bucket(period, since)
+                    rollups = rollups.filter(bucket_start__gte=bucket_start)
+                    activities = activities.filter(
+                        created_at__gte=timezone.make_aware(datetime.combine(bucket_start, time.min))
+                    )
+                rollups.delete()
+
+                buckets = (
+                    activities
+                    .order_by()
+                    .annotate(bucket=truncation)
+                    .values('game_id', 'bucket')
+                    .annotate(total=models.Sum('playtime'), count=models.Count('id'))
+                )
+                rollups = []
+                for bucket in buckets.iterator(chunk_size=batch_size):
+                    rollups.append(cls(
+                        game_id=bucket['game_id'],
+                        period=period,
+                        bucket_start=bucket['bucket'].date(),
+                        playtime=bucket['total'],
+                        sessions=bucket['count'],
+                    ))
+                    if len(rollups) >= batch_size:
+                        created += len(cls.objects.bulk_create(rollups))
+                        rollups = []
+                created += len(cls.objects.bulk_create(rollups))
+
+        return created
+
+
+class ImportStageMetric(TimeStampedModel):
+    class Stage(models.TextChoices):
+        FETCH_OWNED = 'fetch_owned', 'Owned games fetch'
+        STORE_DETAILS = 'store_details', 'Store details call'
+        RATE_LIMIT_WAIT = 'rate_limit_wait', 'Rate limit wait'
+        NORMALIZE = 'normalize', 'Normalization'
+        DB_WRITE = 'db_write', 'DB write batch'
+        CHUNK = 'chunk', 'Import chunk'
+
+    task = models.ForeignKey(
+        BackgroundTask,
+        on_delete=models.CASCADE,
+        related_name='stage_metrics'
+    )
+    stage = models.CharField(max_length=20, choices=Stage.choices)
+    count = models.PositiveIntegerField(default=0)
+    total_time = models.FloatField(default=0.0, verbose_name="total time (seconds)")
+    max_time = models.FloatField(default=0.0, verbose_name="slowest (seconds)")
+    rows = models.PositiveIntegerField(default=0)
+    retries = models.PositiveIntegerField(default=0)
+    bucket_counts = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        ordering = ('task', 'stage')
+        constraints = (
+            models.UniqueConstraint(fields=['task', 'stage'], name='unique_import_stage_metric'),
+        )
+        verbose_name = "import stage metric"
+        verbose_name_plural = "import stage metrics"
+
+    def __str__(self):
+        return f'{self.task_id} {self.stage}: {self.count} x {self.avg_time * 1000:.1f} ms'
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.total_time if self.total_time else 0.0
+
+    def quantile(self, q: float) -> float:
+        target = q * self.count
+        seen = 0
+        for upper_bound, bucket_count in zip(IMPORT_TELEMETRY_BUCKETS, self.bucket_counts):
+            seen += bucket_count
+            if seen >= target and bucket_count:
+                return min(upper_bound, self.max_time)
+        return self.max_time
+
+    @classmethod
+    def record(cls, db_task_id: int, stages: dict[str, dict]):
+        if not stages:
+            return
+
+        with transaction.atomic():
+            existing = {
+                metric.stage: metric
+                for metric in cls.objects.select_for_update().filter(task_id=db_task_id, stage__in=stages)
+            }
+
+            for stage, stats in stages.items():
+                metric = existing.get(stage) or cls(task_id=db_task_id, stage=stage)
+                counts = metric.bucket_counts or [0] * (len(IMPORT_TELEMETRY_BUCKETS) + 1)
+
+                metric.count += stats['count']
+                metric.total_time += stats['total_time']
+                metric.max_time = max(metric.max_time, stats['max_time'])
+                metric.rows += stats['rows']
+                metric.retries += stats['retries']
+                metric.bucket_counts = [
+                    current + added for current, added in zip(counts, stats['bucket_counts'])
+                ]
+                metric.save()
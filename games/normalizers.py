@@ -0,0 +1,33 @@
+from datetime import date, datetime
+
+RELEASE_DATE_FORMATS = ('%d %b, %Y', '%b %d, %Y', '%d %B, %Y', '%B %d, %Y', '%b %Y', '%B %Y', '%Y')
+GENRES_MAX_LENGTH = 255
+
+
+def parse_release_date(release_date: dict | None) -> date | None:
+    raw_date = (release_date or {}).get('date', '').strip()
+    if not raw_date:
+        return None
+
+    for date_format in RELEASE_DATE_FORMATS:
+        try:
+            return datetime.strptime(raw_date, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def extract_promoted_fields(game_data: dict) -> dict:
+    genres = ', '.join(
+        genre.get('description', '')
+        for genre in game_data.get('genres') or []
+        if genre.get('description')
+    )
+
+    return {
+        'rtime_last_played': game_data.get('rtime_last_played') or 0,
+        'playtime_2weeks': game_data.get('playtime_2weeks') or 0,
+        'short_description': game_data.get('short_description') or '',
+        'genres': genres[:GENRES_MAX_LENGTH],
+        'release_date': parse_release_date(game_data.get('release_date')),
+    }
@@ -0,0 +1,110 @@
+import base64
+import binascii
+import json
+from functools import cached_property
+
+from django.db.models import Q, QuerySet
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class KeysetPage:
+    def __init__(self, object_list: list, has_next: bool, has_previous: bool, next_cursor: str, previous_cursor: str):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+
+class KeysetPaginator:
+    def __init__(self, queryset: QuerySet, per_page: int):
+        self.queryset = queryset
+        self.per_page = per_page
+
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        self.ordering = [(field.lstrip('-'), field.startswith('-')) for field in ordering]
+        if not any(field in ('pk', 'id') for field, _ in self.ordering):
+            self.ordering.append(('pk', self.ordering[0][1] if self.ordering else False))
+
+    @cached_property
+    def count(self) -> int:
+        return self.queryset.count()
+
+    def page(self, cursor: str | None) -> KeysetPage:
+        values, direction = self._decode(cursor)
+        backwards = direction == PREVIOUS
+
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self._seek_filter(values, backwards))
+        queryset = queryset.order_by(*self._order_by(reverse=backwards))
+
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if backwards:
+            object_list.reverse()
+
+        has_next = values is not None if backwards else has_more
+        has_previous = has_more if backwards else values is not None
+
+        return KeysetPage(
+            object_list,
+            has_next=has_next,
+            has_previous=has_previous,
+            next_cursor=self._encode(object_list[-1], NEXT) if has_next and object_list else '',
+            previous_cursor=self._encode(object_list[0], PREVIOUS) if has_previous and object_list else '',
+        )
+
+    def _order_by(self, reverse: bool = False) -> list[str]:
+        return [
+            f'-{field}' if descending != reverse else field
+            for field, descending in self.ordering
+        ]
+
+    def _seek_filter(self, values: list, backwards: bool) -> Q:
+        condition = Q()
+        equal_prefix = Q()
+
+        for (field, descending), value in zip(self.ordering, values):
+            lookup = 'lt' if descending != backwards else 'gt'
+            condition |= equal_prefix & Q(**{f'{field}__{lookup}': value})
+            equal_prefix &= Q(**{field: value})
+
+        return condition
+
+    def _encode(self, obj, direction: str) -> str:
+        values = [getattr(obj, field) for field, _ in self.ordering]
+        payload = json.dumps({'v': values, 'd': direction}, separators=(',', ':'), default=str)
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def _decode(self, cursor: str | None) -> tuple[list | None, str]:
+        if not cursor:
+            return None, NEXT
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            values, direction = payload['v'], payload['d']
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            return None, NEXT
+
+        if len(values) != len(self.ordering) or direction not in (NEXT, PREVIOUS):
+            return None, NEXT
+        return values, direction
@@ -0,0 +1,108 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+
+from .constants import GAMES_SEARCH_CONFIG, GAMES_SEARCH_FTS_TABLE, GAMES_SEARCH_VECTOR_COLUMN
+from .models import Game
+
+FTS_COLUMN_WEIGHTS = (10.0, 2.0, 4.0, 3.0)
+SEARCH_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class GameSearchIndex:
+    @staticmethod
+    def filter(queryset: QuerySet, query: str) -> QuerySet:
+        tokens = SEARCH_TOKEN_RE.findall(query)
+        if not tokens:
+            return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+        if connection.vendor == 'sqlite':
+            return GameSearchIndex._filter_fts5(queryset, tokens)
+        if connection.vendor == 'postgresql':
+            return GameSearchIndex._filter_postgres(queryset, tokens)
+
+        condition = Q()
+        for token in tokens:
+            condition &= Q(name__icontains=token) | Q(short_description__icontains=token)
+        return queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    @staticmethod
+    def index_games(games: list[Game]):
+        if connection.vendor != 'sqlite' or not games:
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {GAMES_SEARCH_FTS_TABLE} WHERE rowid IN ({", ".join(["%s"] * len(games))})',
+                [game.pk for game in games]
+            )
+            cursor.executemany(
+                f'INSERT INTO {GAMES_SEARCH_FTS_TABLE} '
+                f'(rowid, name, short_description, genres, developers) VALUES (%s, %s, %s, %s, %s)',
+                [GameSearchIndex._document(game) for game in games]
+            )
+
+    @staticmethod
+    def rebuild(batch_size: int = 500) -> int:
+        if connection.vendor != 'sqlite':
+            return 0
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {GAMES_SEARCH_FTS_TABLE}')
+
+        indexed = 0
+        batch = []
+        games = Game.objects.only('id', 'name', 'short_description', 'genres', 'raw_data')
+        for game in games.iterator(chunk_size=batch_size):
+            batch.append(game)
+            if len(batch) >= batch_size:
+                GameSearchIndex.index_games(batch)
+                indexed += len(batch)
+                batch = []
+
+        GameSearchIndex.index_games(batch)
+        return indexed + len(batch)
+
+    @staticmethod
+    def _document(game: Game) -> tuple:
+        developers = ', '.join((game.raw_data or {}).get('developers') or [])
+        return (game.pk, game.name, game.short_description, game.genres, developers)
+
+    @staticmethod
+    def _filter_fts5(queryset: QuerySet, tokens: list[str]) -> QuerySet:
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        weights = ', '.join(str(weight) for weight in FTS_COLUMN_WEIGHTS)
+        table = GAMES_SEARCH_FTS_TABLE
+
+        # The MATERIALIZED CTE runs MATCH and bm25() once per statement; the per-row
+        # lookup then only probes its result instead of re-running the full-text query.
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {table} WHERE {table} MATCH %s', (match,))
+        ).annotate(
+            search_rank=RawSQL(
+                f'WITH matches AS MATERIALIZED ('
+                f'SELECT rowid, -bm25({table}, {weights}) AS score FROM {table} WHERE {table} MATCH %s'
+                f') SELECT score FROM matches WHERE matches.rowid = {Game._meta.db_table}.id',
+                (match,),
+                output_field=FloatField()
+            )
+        )
+
+    @staticmethod
+    def _filter_postgres(queryset: QuerySet, tokens: list[str]) -> QuerySet:
+        # search_vector is a stored generated column with a GIN index (migration 0010),
+        # so Postgres keeps it in sync on every write and matches use the index.
+        column = f'{Game._meta.db_table}.{GAMES_SEARCH_VECTOR_COLUMN}'
+        params = (GAMES_SEARCH_CONFIG, ' & '.join(f'{token}:*' for token in tokens))
+
+        return queryset.filter(
+            RawSQL(f'{column} @@ to_tsquery(%s::regconfig, %s)', params, output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(
+                f'ts_rank({column}, to_tsquery(%s::regconfig, %s))',
+                params,
+                output_field=FloatField()
+            )
+        )
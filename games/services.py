@@ -1,11 +1,33 @@
 import logging
 import time
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
 from http import HTTPStatus
+from itertools import islice
 
 import requests
+from django.conf import settings
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
 
-from .constants import STEAM_API_URL, STEAM_STORE_URL
+from .constants import (
+    STEAM_API_URL,
+    STEAM_REQUEST_TIMEOUT,
+    STEAM_STORE_URL,
+    STORE_DETAILS_BURST,
+    STORE_DETAILS_DEFAULT_RETRY_AFTER,
+    STORE_DETAILS_MAX_RETRIES,
+    STORE_DETAILS_MAX_WORKERS,
+    STORE_DETAILS_MIN_RATE,
+    STORE_DETAILS_RATE,
+    STORE_DETAILS_STREAM_WINDOW,
+)
+from .models import ImportStageMetric, StoreDetails
+from .rate_limiter import TokenBucket
+from .store_cache import StoreDetailsCache, StoreDetailsResult
+from .telemetry import ImportTelemetry
 
 logger = logging.getLogger(__name__)
 
@@ -15,25 +37,66 @@ class GameServiceInterface(ABC):
     def get_user_games(self, user_id: str, api_key: str) -> list[dict]:
         pass
 
+    @abstractmethod
+    def get_owned_games(self, user_id: str, api_key: str) -> list[dict]:
+        pass
+
+    @abstractmethod
+    def enrich_games(self, games: list[dict]) -> list[dict]:
+        pass
+
+    def iter_enriched_games(self, games: Iterable[dict]) -> Iterator[dict]:
+        yield from self.enrich_games(list(games))
+
 
 class SteamGameService(GameServiceInterface):
+    def __init__(
+        self,
+        max_workers: int = STORE_DETAILS_MAX_WORKERS,
+        rate_limiter: TokenBucket | None = None,
+        store_cache: StoreDetailsCache | None = None,
+        telemetry: ImportTelemetry | None = None,
+        cache_only: bool = False,
+    ):
+        self.max_workers = max_workers
+        self.telemetry = telemetry
+        self.cache_only = cache_only
+        self.api_url = getattr(settings, 'STEAM_API_URL', STEAM_API_URL)
+        self.store_url = getattr(settings, 'STEAM_STORE_URL', STEAM_STORE_URL)
+        self.store_cache = store_cache or StoreDetailsCache()
+        self.rate_limiter = rate_limiter or TokenBucket(
+            rate=getattr(settings, 'STORE_DETAILS_RATE', STORE_DETAILS_RATE),
+            capacity=getattr(settings, 'STORE_DETAILS_BURST', STORE_DETAILS_BURST),
+            min_rate=STORE_DETAILS_MIN_RATE,
+        )
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
     def get_user_games(self, user_id: str, api_key: str) -> list[dict]:
-        raw_games = self._get_games_base_info(user_id, api_key)
+        return self.enrich_games(self.get_owned_games(user_id, api_key))
 
-        games = []
+    def get_owned_games(self, user_id: str, api_key: str) -> list[dict]:
+        return self._get_games_base_info(user_id, api_key)
 
-        for game_data in raw_games:
-            app_id = game_data.get('appid')
-            playtime = game_data.get('playtime_forever', 0)
+    def enrich_games(self, games: list[dict]) -> list[dict]:
+        return list(self.iter_enriched_games(games))
 
-            store_data = {}
-            if playtime:
-                store_data = self._get_store_details(app_id)
+    def iter_enriched_games(self, games: Iterable[dict]) -> Iterator[dict]:
+        iterator = iter(games)
 
-            full_game_data = {**game_data, **store_data}
-            games.append(full_game_data)
+        while window := list(islice(iterator, STORE_DETAILS_STREAM_WINDOW)):
+            played_app_ids = [
+                game_data.get('appid')
+                for game_data in window
+                if game_data.get('playtime_forever', 0)
+            ]
+            store_details = self._get_store_details_many(played_app_ids)
 
-        return games
+            for game_data in window:
+                store_data = store_details.get(str(game_data.get('appid')), {})
+                yield {**game_data, **store_data}
 
     def _get_games_base_info(self, user_id: str, api_key: str) -> list[dict]:
         params = {
@@ -43,36 +106,142 @@ class SteamGameService(GameServiceInterface):
             'include_played_free_games': True,
         }
 
+        started = time.perf_counter()
         try:
-            response = requests.get(
-                STEAM_API_URL,
+            response = self.session.get(
+                self.api_url,
                 params=params,
-                timeout=10
+                timeout=STEAM_REQUEST_TIMEOUT
             )
             response.raise_for_status()
-            return (
+            games = (
                 response.json()
                 .get('response', {})
                 .get('games', [])
             )
+            self._observe(ImportStageMetric.Stage.FETCH_OWNED, time.perf_counter() - started, rows=len(games))
+            return games
         except requests.RequestException as e:
+            self._observe(ImportStageMetric.Stage.FETCH_OWNED, time.perf_counter() - started)
             logger.error(f'Failed to get games for user {user_id}: {e}')
             return []
 
-    def _get_store_details(self, app_id: str) -> dict:
-        try:
-            time.sleep(1.2)
-            response = requests.get(
-                STEAM_STORE_URL,
-                params={'appids': app_id},
-                timeout=10
-            )
-            if response.status_code == HTTPStatus.OK:
-                return (
-                    response.json()
-                    .get(str(app_id), {})
-                    .get('data', {})
+    def _get_store_details_many(self, app_ids: list) -> dict[str, dict]:
+        if not app_ids:
+            return {}
+
+        entries = self.store_cache.get_many(app_ids)
+        store_details = {
+            app_id: entry.data if entry.success else {}
+            for app_id, entry in entries.items()
+            if entry.is_fresh or self.cache_only
+        }
+        missing = [str(app_id) for app_id in app_ids if str(app_id) not in store_details]
+
+        if self.cache_only:
+            logger.info(f'Store details: {len(store_details)} cached, {len(missing)} left to the refresh scheduler')
+            return store_details
+
+        if missing:
+            results = self._fetch_store_details(missing, entries)
+            store_details.update(self.store_cache.store_many(results, entries))
+
+        logger.info(f'Store details: {len(app_ids) - len(missing)} cached, {len(missing)} requested')
+        return store_details
+
+    def refresh_store_details(self, app_ids: list) -> dict[str, dict]:
+        if not app_ids:
+            return {}
+
+        app_ids = [str(app_id) for app_id in app_ids]
+        entries = self.store_cache.get_many(app_ids)
+        results = self._fetch_store_details(app_ids, entries)
+        stored = self.store_cache.store_many(results, entries)
+
+        changed = {result.app_id for result in results if not result.failed and not result.not_modified}
+        logger.info(f'Refreshed store details: {len(changed)} changed, {len(stored) - len(changed)} unchanged, '
+                    f'{len(app_ids) - len(stored)} failed')
+        return {app_id: data for app_id, data in stored.items() if app_id in changed}
+
+    def _fetch_store_details(self, app_ids: list[str], entries: dict[str, StoreDetails]) -> list[StoreDetailsResult]:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(
+                lambda app_id: self._get_store_details(app_id, entries.get(app_id)),
+                app_ids
+            ))
+
+    def _get_store_details(self, app_id: str, cached: StoreDetails | None = None) -> StoreDetailsResult:
+        headers = {}
+        if cached and cached.etag:
+            headers['If-None-Match'] = cached.etag
+        if cached and cached.last_modified:
+            headers['If-Modified-Since'] = cached.last_modified
+
+        for attempt in range(STORE_DETAILS_MAX_RETRIES + 1):
+            waited = self.rate_limiter.acquire()
+            self._observe(ImportStageMetric.Stage.RATE_LIMIT_WAIT, waited)
+
+            started = time.perf_counter()
+            try:
+                response = self.session.get(
+                    self.store_url,
+                    params={'appids': app_id},
+                    headers=headers,
+                    timeout=STEAM_REQUEST_TIMEOUT
                 )
-        except requests.RequestException as e:
-            logger.warning(f'Failed to get store details for game {app_id}: {e}')
-        return {}
+                self._observe(
+                    ImportStageMetric.Stage.STORE_DETAILS,
+                    time.perf_counter() - started,
+                    rows=int(response.status_code == HTTPStatus.OK),
+                    retries=int(response.status_code == HTTPStatus.TOO_MANY_REQUESTS),
+                )
+                if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+                    retry_after = self._parse_retry_after(response)
+                    logger.info(f'Store rate limit hit for game {app_id}, retrying in {retry_after:.0f}s')
+                    self.rate_limiter.backoff(retry_after)
+                    continue
+
+                validators = {
+                    'etag': response.headers.get('ETag', ''),
+                    'last_modified': response.headers.get('Last-Modified', ''),
+                }
+
+                if response.status_code == HTTPStatus.NOT_MODIFIED and cached:
+                    self.rate_limiter.recover()
+                    return StoreDetailsResult(app_id, {}, not_modified=True, **validators)
+
+                if response.status_code == HTTPStatus.OK:
+                    self.rate_limiter.recover()
+                    app_data = response.json().get(str(app_id)) or {}
+                    return StoreDetailsResult(
+                        app_id,
+                        app_data.get('data', {}),
+                        success=bool(app_data.get('success')),
+                        **validators
+                    )
+            except requests.RequestException as e:
+                self._observe(ImportStageMetric.Stage.STORE_DETAILS, time.perf_counter() - started)
+                logger.warning(f'Failed to get store details for game {app_id}: {e}')
+            return StoreDetailsResult(app_id, {}, failed=True)
+
+        logger.warning(f'Gave up on store details for game {app_id} after {attempt} retries')
+        return StoreDetailsResult(app_id, {}, failed=True)
+
+    def _observe(self, stage: str, seconds: float, **kwargs: int):
+        if self.telemetry:
+            self.telemetry.observe(stage, seconds, **kwargs)
+
+    @staticmethod
+    def _parse_retry_after(response: requests.Response) -> float:
+        retry_after = response.headers.get('Retry-After')
+        if not retry_after:
+            return STORE_DETAILS_DEFAULT_RETRY_AFTER
+
+        if retry_after.isdigit():
+            return float(retry_after)
+
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return STORE_DETAILS_DEFAULT_RETRY_AFTER
+        return max(0.0, (retry_at - timezone.now()).total_seconds())
@@ -0,0 +1,130 @@
+import gzip
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+
+from django.utils import timezone
+
+from .constants import SNAPSHOT_STORE_BATCH_SIZE, STORE_DETAILS_STREAM_WINDOW
+from .services import GameServiceInterface
+from .store_cache import StoreDetailsCache, StoreDetailsResult
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_SUFFIXES = ('.json', '.jsonl', '.json.gz', '.jsonl.gz')
+
+
+def iter_snapshot_files(paths: Iterable[Path]) -> Iterator[Path]:
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            yield from sorted(
+                file for file in path.rglob('*')
+                if file.is_file() and file.name.endswith(SNAPSHOT_SUFFIXES)
+            )
+        elif path.is_file():
+            yield path
+        else:
+            raise FileNotFoundError(f'Snapshot path does not exist: {path}')
+
+
+def iter_snapshot_records(path: Path) -> Iterator[dict]:
+    opener = gzip.open if path.suffix == '.gz' else open
+    json_lines = path.name.removesuffix('.gz').endswith('.jsonl')
+
+    with opener(path, 'rt', encoding='utf-8') as file:
+        if json_lines:
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.error(f'Skipping invalid line {line_number} in {path}: {e}')
+            return
+
+        payload = json.load(file)
+        yield from payload if isinstance(payload, list) else [payload]
+
+
+def split_snapshot_record(record: dict) -> tuple[list[dict], list[StoreDetailsResult]]:
+    if not isinstance(record, dict):
+        return [], []
+    if 'response' in record:
+        return record['response'].get('games', []), []
+    if 'appid' in record:
+        return [record], []
+    if 'steam_appid' in record:
+        return [], [StoreDetailsResult(str(record['steam_appid']), record)]
+
+    store_details = [
+        StoreDetailsResult(app_id, app_data.get('data', {}), success=bool(app_data.get('success')))
+        for app_id, app_data in record.items()
+        if app_id.isdigit() and isinstance(app_data, dict) and 'success' in app_data
+    ]
+    return [], store_details
+
+
+class SnapshotGameService(GameServiceInterface):
+    def __init__(self, paths: Iterable[Path], store_cache: StoreDetailsCache | None = None):
+        self.paths = list(paths)
+        self.store_cache = store_cache or StoreDetailsCache()
+
+    def get_user_games(self, user_id: str | None = None, api_key: str | None = None) -> list[dict]:
+        return self.enrich_games(self.get_owned_games(user_id, api_key))
+
+    def get_owned_games(self, user_id: str | None = None, api_key: str | None = None) -> list[dict]:
+        return list(self.iter_owned_games())
+
+    def enrich_games(self, games: list[dict]) -> list[dict]:
+        return list(self.iter_enriched_games(games))
+
+    def iter_owned_games(self) -> Iterator[dict]:
+        for path in iter_snapshot_files(self.paths):
+            for record in iter_snapshot_records(path):
+                owned_games, _ = split_snapshot_record(record)
+                yield from owned_games
+
+    def iter_enriched_games(self, games: Iterable[dict]) -> Iterator[dict]:
+        iterator = iter(games)
+
+        while window := list(islice(iterator, STORE_DETAILS_STREAM_WINDOW)):
+            entries = self.store_cache.get_many([game_data.get('appid') for game_data in window])
+
+            for game_data in window:
+                entry = entries.get(str(game_data.get('appid')))
+                store_data = entry.data if entry and entry.success else {}
+                yield {**game_data, **store_data}
+
+    def load_store_details(self, batch_size: int = SNAPSHOT_STORE_BATCH_SIZE) -> int:
+        loaded = 0
+        batch = []
+
+        for path in iter_snapshot_files(self.paths):
+            for record in iter_snapshot_records(path):
+                _, store_details = split_snapshot_record(record)
+                batch.extend(store_details)
+                if len(batch) >= batch_size:
+                    loaded += self._store_batch(batch)
+                    batch = []
+
+        loaded += self._store_batch(batch)
+        logger.info(f'Loaded {loaded} store details from snapshots')
+        return loaded
+
+    def _store_batch(self, results: list[StoreDetailsResult]) -> int:
+        if not results:
+            return 0
+
+        latest = {result.app_id: result for result in results}
+        entries = self.store_cache.get_many(list(latest))
+        # Archived appdetails carry no validators and may be arbitrarily old, so they
+        # are stored already expired for the refresh scheduler to revalidate, and never
+        # replace an entry fetched live within its TTL.
+        archived = [
+            result for app_id, result in latest.items()
+            if not (app_id in entries and entries[app_id].is_fresh)
+        ]
+        return len(self.store_cache.store_many(archived, entries, expires_at=timezone.now()))
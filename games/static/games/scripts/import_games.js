@@ -4,8 +4,29 @@ document.addEventListener('DOMContentLoaded', () => {
     const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]')?.value || '';
 
     let currentTaskId = importBtn?.dataset.taskId || null;
+    let eventSource = null;
 
-    function updateUI(status) {
+    function formatProgress(progress) {
+        if (!progress || !progress.phase) return '';
+
+        if (progress.phase === 'fetching') {
+            return 'Fetching owned games...';
+        }
+
+        const processed = (progress.written || 0) + (progress.failed || 0);
+        const parts = [`${processed}/${progress.changed || 0} games processed`];
+
+        if (progress.failed) {
+            parts.push(`${progress.failed} failed`);
+        }
+        if (progress.chunks_total) {
+            parts.push(`chunk ${progress.chunks_done || 0}/${progress.chunks_total}`);
+        }
+
+        return `Importing: ${parts.join(', ')}`;
+    }
+
+    function updateUI(status, progress) {
         const states = {
             'PENDING': { btnText: 'Importing...', infoText: 'Import in progress...', isDisabled: true },
             'SUCCESS': { btnText: 'Success', infoText: 'Import completed.', isDisabled: true },
@@ -21,10 +42,10 @@ document.addEventListener('DOMContentLoaded', () => {
         }
 
         if (statusText) {
-            statusText.innerText = currentState.infoText;
+            statusText.innerText = (status === 'PENDING' && formatProgress(progress)) || currentState.infoText;
         }
 
-        if (status === 'PENDING' && currentTaskId) {
+        if (status === 'PENDING' && currentTaskId && !eventSource) {
             setTimeout(() => checkStatus(currentTaskId), 3000); 
         }
 
@@ -42,15 +63,40 @@ document.addEventListener('DOMContentLoaded', () => {
             const response = await fetch(checkUrl);
             const data = await response.json();
             
-            updateUI(data.status);
+            updateUI(data.status, data.progress);
         } catch (error) {
             console.error('Checking import status error:', error);
         }
     }
 
+    function watchTask(taskId) {
+        if (!window.EventSource) {
+            checkStatus(taskId);
+            return;
+        }
+
+        eventSource = new EventSource(`/games/import-status/${taskId}/stream/`);
+
+        eventSource.onmessage = (event) => {
+            const data = JSON.parse(event.data);
+
+            if (data.status !== 'PENDING') {
+                eventSource.close();
+                eventSource = null;
+            }
+            updateUI(data.status, data.progress);
+        };
+
+        eventSource.onerror = () => {
+            eventSource.close();
+            eventSource = null;
+            checkStatus(taskId);
+        };
+    }
+
     if (currentTaskId) {
         updateUI('PENDING');
-        checkStatus(currentTaskId);
+        watchTask(currentTaskId);
     }
 
     importBtn?.addEventListener('click', async () => {
@@ -68,7 +114,7 @@ document.addEventListener('DOMContentLoaded', () => {
             
             if (data.task_id) {
                 currentTaskId = data.task_id;
-                checkStatus(currentTaskId);
+                watchTask(currentTaskId);
             } else {
                 updateUI('FAILED');
                 statusText.innerText = 'Error: server did not return task id.';
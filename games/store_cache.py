@@ -0,0 +1,118 @@
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+from .constants import (
+    STORE_DETAILS_CACHE_MAX_ENTRIES,
+    STORE_DETAILS_CACHE_NEGATIVE_TTL,
+    STORE_DETAILS_CACHE_TTL,
+    STORE_DETAILS_CACHE_TTL_JITTER,
+)
+from .models import StoreDetails
+
+
+@dataclass
+class StoreDetailsResult:
+    app_id: str
+    data: dict
+    success: bool = True
+    etag: str = ''
+    last_modified: str = ''
+    not_modified: bool = False
+    failed: bool = False
+
+
+class StoreDetailsCache:
+    def __init__(
+        self,
+        ttl: int = STORE_DETAILS_CACHE_TTL,
+        negative_ttl: int = STORE_DETAILS_CACHE_NEGATIVE_TTL,
+        max_entries: int = STORE_DETAILS_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+
+    def get_many(self, app_ids: list) -> dict[str, StoreDetails]:
+        app_ids = [str(app_id) for app_id in app_ids]
+        entries = {
+            entry.app_id: entry
+            for entry in StoreDetails.objects.filter(app_id__in=app_ids)
+        }
+
+        fresh_ids = [app_id for app_id, entry in entries.items() if entry.is_fresh]
+        if fresh_ids:
+            StoreDetails.objects.filter(app_id__in=fresh_ids).update(
+                accessed_at=timezone.now()
+            )
+
+        return entries
+
+    def store_many(
+        self,
+        results: list[StoreDetailsResult],
+        entries: dict[str, StoreDetails],
+        expires_at: datetime | None = None,
+    ) -> dict[str, dict]:
+        now = timezone.now()
+        to_save = []
+        stored = {}
+
+        for result in results:
+            if result.failed:
+                continue
+
+            entry = entries.get(result.app_id)
+            if result.not_modified and entry:
+                result.data = entry.data
+                result.success = entry.success
+                result.etag = result.etag or entry.etag
+                result.last_modified = result.last_modified or entry.last_modified
+
+            to_save.append(
+                StoreDetails(
+                    app_id=result.app_id,
+                    data=result.data if result.success else {},
+                    success=result.success,
+                    etag=result.etag,
+                    last_modified=result.last_modified,
+                    expires_at=expires_at or now + self._entry_ttl(result.success),
+                    accessed_at=now,
+                    created_at=entry.created_at if entry else now,
+                )
+            )
+            stored[result.app_id] = result.data if result.success else {}
+
+        if to_save:
+            StoreDetails.objects.bulk_create(
+                to_save,
+                update_conflicts=True,
+                unique_fields=['app_id'],
+                update_fields=[
+                    'data', 'success', 'etag', 'last_modified',
+                    'expires_at', 'accessed_at', 'updated_at',
+                ],
+                batch_size=500,
+            )
+            self.prune()
+
+        return stored
+
+    def prune(self):
+        overflow = StoreDetails.objects.count() - self.max_entries
+        if overflow <= 0:
+            return
+
+        stale_ids = list(
+            StoreDetails.objects
+            .order_by('accessed_at')
+            .values_list('id', flat=True)[:overflow]
+        )
+        StoreDetails.objects.filter(id__in=stale_ids).delete()
+
+    def _entry_ttl(self, success: bool) -> timedelta:
+        ttl = self.ttl if success else self.negative_ttl
+        jitter = ttl * STORE_DETAILS_CACHE_TTL_JITTER
+        return timedelta(seconds=ttl + random.uniform(-jitter, jitter))
@@ -0,0 +1,59 @@
+import heapq
+import math
+from datetime import datetime, timedelta
+
+from django.db.models import OuterRef, Q, Subquery
+from django.utils import timezone
+
+from .constants import (
+    STORE_REFRESH_LOOKAHEAD,
+    STORE_REFRESH_MISSING_STALENESS,
+    STORE_REFRESH_RECENT_BOOST,
+    STORE_REFRESH_RECENT_DAYS,
+)
+from .models import Game, StoreDetails
+
+
+class StoreRefreshScheduler:
+    def __init__(self, lookahead: int = STORE_REFRESH_LOOKAHEAD):
+        self.lookahead = timedelta(seconds=lookahead)
+
+    def next_batch(self, budget: int) -> list[str]:
+        now = timezone.now()
+        queue = (
+            (self.priority(now, *row[1:]), row[0])
+            for row in self._candidates(now).iterator()
+        )
+        return [app_id for _, app_id in heapq.nlargest(budget, queue)]
+
+    def priority(
+        self,
+        now: datetime,
+        playtime: float,
+        playtime_2weeks: int,
+        rtime_last_played: int,
+        expires_at: datetime | None,
+    ) -> float:
+        if expires_at is None:
+            staleness = STORE_REFRESH_MISSING_STALENESS
+        else:
+            staleness = max(0.0, (now - expires_at + self.lookahead) / timedelta(days=1))
+
+        popularity = math.log1p(playtime)
+        if playtime_2weeks:
+            popularity += STORE_REFRESH_RECENT_BOOST
+        if rtime_last_played and now.timestamp() - rtime_last_played < STORE_REFRESH_RECENT_DAYS * 86400:
+            popularity += 1
+
+        return (1 + staleness) * (1 + popularity)
+
+    def _candidates(self, now: datetime):
+        expires_at = StoreDetails.objects.filter(app_id=OuterRef('game_id')).values('expires_at')[:1]
+        return (
+            Game.objects
+            .filter(playtime__gt=0)
+            .annotate(store_expires_at=Subquery(expires_at))
+            .filter(Q(store_expires_at__isnull=True) | Q(store_expires_at__lte=now + self.lookahead))
+            .order_by()
+            .values_list('game_id', 'playtime', 'playtime_2weeks', 'rtime_last_played', 'store_expires_at')
+        )
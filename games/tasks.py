@@ -1,42 +1,179 @@
 import logging
+import time
 
-from celery import shared_task
+import requests
+from celery import chord, shared_task
+from django.conf import settings
+from django.db import OperationalError
 
 from core.models import BackgroundTask
 
+from .constants import (
+    IMPORT_CHUNK_MAX_RETRIES,
+    IMPORT_CHUNK_SIZE,
+    IMPORT_WRITE_BATCH_SIZE,
+    STORE_DETAILS_IMPORT_CACHE_ONLY,
+    STORE_REFRESH_BUDGET,
+)
 from .db_services import GameDBService
+from .events import publish_import_event
+from .models import ImportStageMetric, SteamSyncWatermark
 from .services import SteamGameService
+from .store_refresh import StoreRefreshScheduler
+from .telemetry import ImportTelemetry
 
 logger = logging.getLogger(__name__)
 
 
 @shared_task
-def import_steam_games(steam_id: str, api_key: str, db_task_id: int):
+def import_steam_games(steam_id: str, api_key: str, db_task_id: int, incremental: bool = True):
     logger.info(f'Starting Steam games import for user {steam_id}...')
 
     try:
-        steam_service = SteamGameService()
-        owned_games = steam_service.get_user_games(
+        _report_progress(db_task_id, phase='fetching')
+        telemetry = ImportTelemetry()
+        steam_service = SteamGameService(telemetry=telemetry)
+        owned_games = steam_service.get_owned_games(
             user_id=steam_id,
             api_key=api_key
         )
+        telemetry.flush(db_task_id)
 
         if not owned_games:
-            BackgroundTask.change_status(
-                db_task_id, BackgroundTask.Status.FAILED
-            )
+            _report_progress(db_task_id, phase='failed', status=BackgroundTask.Status.FAILED)
             logger.warning('No games found for this Steam ID.')
             return
 
-        success_count, error_count = GameDBService.save_games(owned_games)
-        BackgroundTask.change_status(
-            db_task_id, BackgroundTask.Status.SUCCESS
+        changed_games = owned_games
+        if incremental:
+            watermark, _ = SteamSyncWatermark.objects.get_or_create(steam_id=steam_id)
+            changed_games = GameDBService.select_changed_games(owned_games, watermark)
+            logger.info(f'Incremental sync: {len(changed_games)} of {len(owned_games)} games changed.')
+
+        last_played_at = max(
+            (game.get('rtime_last_played', 0) for game in owned_games),
+            default=0
         )
-        logger.info(f'Import finished. Successfully imported: {success_count}, Errors: {error_count}.')
+        chunks = [
+            changed_games[i:i + IMPORT_CHUNK_SIZE]
+            for i in range(0, len(changed_games), IMPORT_CHUNK_SIZE)
+        ]
 
-    except Exception as e:
-        BackgroundTask.change_status(
-            db_task_id, BackgroundTask.Status.FAILED
+        _report_progress(
+            db_task_id,
+            phase='enriching',
+            fetched=len(owned_games),
+            changed=len(changed_games),
+            chunks_total=len(chunks),
         )
+
+        if not chunks:
+            finish_steam_import([], steam_id, last_played_at, db_task_id)
+            return
+
+        logger.info(f'Dispatching {len(chunks)} import chunks of up to {IMPORT_CHUNK_SIZE} games.')
+        chord(
+            import_games_chunk.s(chunk, db_task_id, index) for index, chunk in enumerate(chunks)
+        )(
+            finish_steam_import.s(steam_id, last_played_at, db_task_id).on_error(
+                fail_steam_import.si(db_task_id)
+            )
+        )
+
+    except Exception as e:
+        _report_progress(db_task_id, phase='failed', status=BackgroundTask.Status.FAILED)
         logger.error(f'Error during import: {e}')
         raise e
+
+
+@shared_task(
+    bind=True,
+    acks_late=True,
+    autoretry_for=(requests.RequestException, OperationalError),
+    retry_backoff=True,
+    max_retries=IMPORT_CHUNK_MAX_RETRIES,
+)
+def import_games_chunk(self, games: list[dict], db_task_id: int, chunk_index: int = 0) -> tuple[int, int]:
+    chunk_progress = {'enriched': 0, 'written': 0, 'failed': 0, 'chunks_done': 0}
+
+    def report_batch(processed: int, errors: int):
+        chunk_progress['enriched'] += processed
+        chunk_progress['written'] += processed - errors
+        chunk_progress['failed'] += errors
+        _report_progress(db_task_id, part=f'chunk-{chunk_index}', **chunk_progress)
+
+    telemetry = ImportTelemetry()
+    steam_service = SteamGameService(
+        telemetry=telemetry,
+        cache_only=getattr(settings, 'STORE_DETAILS_IMPORT_CACHE_ONLY', STORE_DETAILS_IMPORT_CACHE_ONLY),
+    )
+    started = time.perf_counter()
+    try:
+        result = GameDBService.save_games_stream(
+            steam_service.iter_enriched_games(games),
+            batch_size=IMPORT_WRITE_BATCH_SIZE,
+            on_batch=report_batch,
+            telemetry=telemetry,
+        )
+    finally:
+        telemetry.observe(
+            ImportStageMetric.Stage.CHUNK,
+            time.perf_counter() - started,
+            rows=len(games),
+            retries=self.request.retries,
+        )
+        telemetry.flush(db_task_id)
+
+    chunk_progress['chunks_done'] = 1
+    _report_progress(db_task_id, part=f'chunk-{chunk_index}', **chunk_progress)
+    return result
+
+
+@shared_task
+def finish_steam_import(chunk_results: list, steam_id: str, last_played_at: int, db_task_id: int):
+    success_count = sum(created for created, _ in chunk_results)
+    error_count = sum(errors for _, errors in chunk_results)
+
+    SteamSyncWatermark.advance(steam_id, last_played_at)
+    _report_progress(db_task_id, phase='done', status=BackgroundTask.Status.SUCCESS)
+    logger.info(f'Import finished. Successfully imported: {success_count}, Errors: {error_count}.')
+
+
+@shared_task
+def fail_steam_import(db_task_id: int):
+    _report_progress(db_task_id, phase='failed', status=BackgroundTask.Status.FAILED)
+    logger.error(f'Import task {db_task_id} failed in one of its chunks.')
+
+
+@shared_task
+def compact_game_activity():
+    return GameDBService.prune_activity()
+
+
+@shared_task
+def refresh_store_details(budget: int = STORE_REFRESH_BUDGET) -> int:
+    app_ids = StoreRefreshScheduler().next_batch(budget)
+    if not app_ids:
+        return 0
+
+    store_details = SteamGameService().refresh_store_details(app_ids)
+    updated = GameDBService.apply_store_details(store_details)
+    logger.info(f'Store refresh: {len(app_ids)} scheduled, {updated} games updated.')
+    return updated
+
+
+def _report_progress(
+    db_task_id: int,
+    phase: str | None = None,
+    status: str | None = None,
+    part: str | None = None,
+    **counters: int
+):
+    progress = BackgroundTask.update_progress(db_task_id, phase=phase, part=part, **counters)
+    if status:
+        BackgroundTask.change_status(db_task_id, status)
+
+    publish_import_event(db_task_id, {
+        'status': status or BackgroundTask.Status.PENDING,
+        'progress': progress,
+    })
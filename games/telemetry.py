@@ -0,0 +1,43 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from .constants import IMPORT_TELEMETRY_BUCKETS
+from .models import ImportStageMetric
+
+
+class ImportTelemetry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    @contextmanager
+    def measure(self, stage: str, rows: int = 0):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, rows=rows)
+
+    def observe(self, stage: str, seconds: float, rows: int = 0, retries: int = 0):
+        with self._lock:
+            stats = self._stages.setdefault(stage, {
+                'count': 0,
+                'total_time': 0.0,
+                'max_time': 0.0,
+                'rows': 0,
+                'retries': 0,
+                'bucket_counts': [0] * (len(IMPORT_TELEMETRY_BUCKETS) + 1),
+            })
+            stats['count'] += 1
+            stats['total_time'] += seconds
+            stats['max_time'] = max(stats['max_time'], seconds)
+            stats['rows'] += rows
+            stats['retries'] += retries
+            stats['bucket_counts'][bisect_left(IMPORT_TELEMETRY_BUCKETS, seconds)] += 1
+
+    def flush(self, db_task_id: int):
+        with self._lock:
+            stages, self._stages = self._stages, {}
+        ImportStageMetric.record(db_task_id, stages)
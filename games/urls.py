@@ -1,13 +1,25 @@
 from django.urls import path
 
-from .views import DashboardView, GameDetailView, GameListView, start_import_task_view, check_import_task_status_view
+from .views import (
+    DashboardView,
+    GameDetailView,
+    GameListView,
+    check_import_task_status_view,
+    export_view,
+    game_history_view,
+    import_status_stream_view,
+    start_import_task_view,
+)
 
 app_name = 'games'
 
 urlpatterns = [
     path('<int:pk>/', GameDetailView.as_view(), name='game-detail'),
+    path('<int:pk>/history/', game_history_view, name='game-history'),
     path('dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('export/<str:dataset>/', export_view, name='export'),
     path('import-start/', start_import_task_view, name='import_start'),
     path('import-status/<str:task_id>/', check_import_task_status_view, name='import_status'),
+    path('import-status/<str:task_id>/stream/', import_status_stream_view, name='import_status_stream'),
     path('', GameListView.as_view(), name='game-list'),
 ]
@@ -1,18 +1,30 @@
-import json
 import os
 import uuid
-from datetime import timedelta
+from datetime import date
 
-from django.db import models
-from django.db.models import Q
-from django.http import JsonResponse
-from django.utils import timezone
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from django.views.decorators.http import require_GET, require_POST
 from django.views.generic import DetailView, ListView, TemplateView
 
 from core.models import BackgroundTask
 
-from .models import Game, GameActivity
+from .cache import get_or_compute
+from .constants import (
+    HISTORY_DEFAULT_MAX_POINTS,
+    HISTORY_DEFAULT_RANGE,
+    HISTORY_MAX_POINTS_LIMIT,
+    HISTORY_RANGES,
+)
+from .events import stream_import_events
+from .exports import EXPORT_FORMATS, iter_export_chunks, resolve_fields
+from .history import get_playtime_series, resolve_range
+from .metrics import registry
+from .models import Game, PlaytimeSummary
+from .pagination import KeysetPaginator
+from .search import GameSearchIndex
 from .tasks import import_steam_games
 
 
@@ -23,33 +35,46 @@ class GameListView(ListView):
     paginate_by = 30
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = Game.objects.for_list()
 
         search_query = self.request.GET.get('q')
         if search_query:
-            queryset = queryset.filter(
-                Q(name__icontains=search_query) |
-                Q(raw_data__short_description__icontains=search_query)
-            )
+            queryset = GameSearchIndex.filter(queryset, search_query)
 
         order_by = self.request.GET.get('order_by')
         ordering_fields = {
             'playtime_desc': '-playtime',
             'playtime_asc': 'playtime',
             'name': 'name',
-            'last_played': '-raw_data__rtime_last_played',
+            'last_played': '-rtime_last_played',
         }
 
         if order_by in ordering_fields:
             queryset = queryset.order_by(ordering_fields[order_by])
+        elif search_query and order_by in (None, 'relevance'):
+            queryset = queryset.order_by('-search_rank', '-playtime')
         else:
             queryset = queryset.order_by('-playtime')
 
         return queryset
 
+    def paginate_queryset(self, queryset, page_size):
+        if self.page_kwarg in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, page_size)
+        cursor = self.request.GET.get('cursor')
+        page = get_or_compute(
+            'game-list',
+            {name: self.request.GET.get(name, '') for name in ('q', 'order_by', 'cursor')},
+            lambda: paginator.page(cursor),
+        )
+        return paginator, page, page.object_list, page.has_other_pages()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
+        context['is_keyset_page'] = isinstance(context['paginator'], KeysetPaginator)
         context['active_task_id'] = ""
 
         if self.request.user.is_authenticated:
@@ -62,29 +87,35 @@ class GameListView(ListView):
                 context['active_task_id'] = active_task.task_id
 
         context['search_query'] = self.request.GET.get('q', '')
-        context['order_by'] = self.request.GET.get('order_by', 'playtime_desc')
+        context['order_by'] = self.request.GET.get(
+            'order_by', 'relevance' if context['search_query'] else 'playtime_desc'
+        )
 
         return context
 
 
 class GameDetailView(DetailView):
     model = Game
+    queryset = Game.objects.defer('raw_data')
     template_name = 'games/game_detail.html'
     context_object_name = 'game'
 
+    def get_object(self, queryset=None):
+        return get_or_compute(
+            'game-detail',
+            {'pk': self.kwargs[self.pk_url_kwarg]},
+            lambda: super(GameDetailView, self).get_object(queryset),
+        )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        game_activities = self.object.history.all().order_by('created_at')
 
-        dates = []
-        playtimes = []
+        history_range = self.request.GET.get('range')
+        if history_range not in HISTORY_RANGES:
+            history_range = HISTORY_DEFAULT_RANGE
 
-        for activity in game_activities:
-            dates.append(activity.created_at.strftime('%m %d %Y'))
-            playtimes.append(activity.playtime)
-
-        context['graph_dates'] = json.dumps(dates)
-        context['graph_playtimes'] = json.dumps(playtimes)
+        context['history_range'] = history_range
+        context['history_ranges'] = HISTORY_RANGES
 
         return context
 
@@ -95,42 +126,68 @@ class DashboardView(TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        playtime_stats = GameActivity.objects.aggregate(
-            total_playtime=models.Sum('playtime')
-        )
-
-        mins_played = playtime_stats['total_playtime'] or 0.0
-
-        context['total_playtime'] = mins_played / 60
-        context['top_played'] = Game.objects.order_by('-playtime')[:5]
-
-        longest_session = GameActivity.objects.order_by('-playtime').first()
+        context.update(get_or_compute('dashboard', None, self._get_statistics))
+        return context
 
-        if longest_session:
-            context['longest_session'] = {
-                'game': longest_session.game,
-                'playtime': longest_session.playtime / 60
+    @staticmethod
+    def _get_statistics():
+        summary = (
+            PlaytimeSummary.objects
+            .select_related('longest_session_game')
+            .only('total_playtime', 'session_count', 'longest_session',
+                  'longest_session_game__id', 'longest_session_game__name')
+            .filter(pk=1)
+            .first()
+        ) or PlaytimeSummary()
+
+        if summary.longest_session_game:
+            longest_session = {
+                'game': summary.longest_session_game,
+                'playtime': summary.longest_session / 60
             }
         else:
-            context['longest_session'] = {
+            longest_session = {
                 'game': 'No sessions for this time period',
                 'playtime': 0.0
             }
 
-        avg_session = GameActivity.objects.aggregate(
-            avg_playtime=models.Avg('playtime')
-        )
-
-        mins_avg = avg_session['avg_playtime'] or 0.0
-
-        context['avg_session'] = mins_avg / 60
+        return {
+            'total_playtime': summary.total_playtime / 60,
+            'top_played': list(Game.objects.for_list().order_by('-playtime')[:5]),
+            'longest_session': longest_session,
+            'avg_session': summary.avg_session / 60,
+            # Live rather than stored: it must drop as days pass without any import writing activity.
+            'games_last_month': PlaytimeSummary.count_games_last_month(),
+        }
 
-        month_ago = timezone.now() - timedelta(days=30)
-        context['games_last_month'] = GameActivity.objects.filter(
-            created_at__gte=month_ago
-        ).values('game').distinct().count()
 
-        return context
+@require_GET
+def game_history_view(request, pk):
+    game = get_object_or_404(Game.objects.only('id'), pk=pk)
+
+    try:
+        start = date.fromisoformat(request.GET['start']) if request.GET.get('start') else None
+        end = date.fromisoformat(request.GET['end']) if request.GET.get('end') else None
+        max_points = int(request.GET.get('max_points', HISTORY_DEFAULT_MAX_POINTS))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid start, end or max_points'}, status=400)
+
+    max_points = min(max(max_points, 3), HISTORY_MAX_POINTS_LIMIT)
+    start, end = resolve_range(request.GET.get('range', HISTORY_DEFAULT_RANGE), start, end)
+    if start and start > end:
+        return JsonResponse({'error': 'start must not be after end'}, status=400)
+
+    series = get_or_compute(
+        'game-history',
+        {'pk': game.pk, 'start': start or '', 'end': end, 'max_points': max_points},
+        lambda: get_playtime_series(game, start, end, max_points),
+    )
+    return JsonResponse({
+        'game': game.pk,
+        'start': start.isoformat() if start else None,
+        'end': end.isoformat(),
+        **series,
+    })
 
 
 @require_POST
@@ -166,15 +223,70 @@ def check_import_task_status_view(request, task_id):
     if not request.user.is_authenticated:
         return JsonResponse({'error': 'Unauthorized'}, status=401)
 
-    if not request.user.background_tasks.filter(task_id=task_id).exists():
+    db_task = request.user.background_tasks.filter(task_id=task_id).first()
+    if not db_task:
         return JsonResponse({'error': 'Task not found'}, status=404)
 
-    celery_task = import_steam_games.AsyncResult(task_id)
-
-    result = celery_task.result if celery_task.ready() else None
-
     return JsonResponse({
-        'task_id': celery_task.id,
-        'status': celery_task.status,
-        'result': result
+        'task_id': db_task.task_id,
+        'status': db_task.status,
+        'progress': db_task.progress,
     })
+
+
+@require_GET
+async def import_status_stream_view(request, task_id):
+    # A WSGI worker buffers the whole event stream; refuse so the client polls instead.
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'error': 'Event stream requires an ASGI server'}, status=503)
+
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+
+    db_task = await user.background_tasks.filter(task_id=task_id).afirst()
+    if not db_task:
+        return JsonResponse({'error': 'Task not found'}, status=404)
+
+    return StreamingHttpResponse(
+        stream_import_events(db_task, BackgroundTask.Status.PENDING),
+        content_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@require_GET
+def export_view(request, dataset):
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+
+    export_format = request.GET.get('format', 'csv')
+    fields = [field for field in request.GET.get('fields', '').split(',') if field]
+
+    try:
+        start = date.fromisoformat(request.GET['start']) if request.GET.get('start') else None
+        end = date.fromisoformat(request.GET['end']) if request.GET.get('end') else None
+        fields = resolve_fields(dataset, fields)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse({'error': f'Unknown export format: {export_format}'}, status=400)
+
+    content_type, extension = EXPORT_FORMATS[export_format]
+    return StreamingHttpResponse(
+        iter_export_chunks(dataset, export_format, list(fields), start, end),
+        content_type=content_type,
+        headers={
+            'Content-Disposition': f'attachment; filename="{dataset}.{extension}"',
+            'X-Accel-Buffering': 'no',
+        },
+    )
+
+
+@require_GET
+def metrics_view(request):
+    if not settings.GAMES_METRICS_ENDPOINT:
+        raise Http404
+
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4')